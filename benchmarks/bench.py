@@ -0,0 +1,324 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+# Microbenchmarks for the class_commands registration and invocation paths.
+#
+# Everything runs offline against the fake interaction objects in fakes.py.
+# Results are written as JSON so runs across releases can be compared:
+#
+#     $ python benchmarks/bench.py --output before.json
+#     $ python benchmarks/bench.py --compare before.json
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import types
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import discord
+from discord import app_commands
+from discord.ext import class_commands
+from discord.ext.class_commands import MessageCommand, Option, SlashCommand, UserCommand
+
+from fakes import FakeInteraction
+
+Result = Dict[str, Any]
+
+OPTIONS = {'query': 'tea', 'amount': 3}
+TARGET = discord.Object(id=5)
+
+
+# Command definitions
+
+
+async def _noop(self) -> None:
+    pass
+
+
+async def _choices(self, focused: str) -> List[app_commands.Choice[str]]:
+    return [app_commands.Choice(name=focused, value=focused)]
+
+
+def _make_class(index: int) -> Any:
+    def body(ns: Dict[str, Any]) -> None:
+        ns['__module__'] = __name__
+        ns['__doc__'] = 'Benchmark command.'
+        ns['__annotations__'] = {'query': 'str', 'amount': 'int', 'member': 'Optional[discord.Member]'}
+        ns['query'] = Option(description='What to search for', autocomplete=True)
+        ns['amount'] = 1
+        ns['member'] = None
+        ns['callback'] = _noop
+        ns['autocomplete'] = _choices
+
+    return types.new_class(f'Command{index}', (SlashCommand,), {}, body)
+
+
+def _make_function(index: int) -> app_commands.Command:
+    async def command(
+        interaction: discord.Interaction, query: str, amount: int = 1, member: Optional[discord.Member] = None
+    ) -> None:
+        pass
+
+    async def autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return [app_commands.Choice(name='query', value=current)]
+
+    cmd = app_commands.command(name=f'command{index}', description='Benchmark command.')(command)
+    cmd.autocomplete('query')(autocomplete)
+    return cmd
+
+
+class ClassUser(UserCommand):
+    async def callback(self) -> None:
+        pass
+
+
+class ClassMessage(MessageCommand):
+    async def callback(self) -> None:
+        pass
+
+
+async def _user_function(interaction: discord.Interaction, member: discord.Member) -> None:
+    pass
+
+
+async def _message_function(interaction: discord.Interaction, message: discord.Message) -> None:
+    pass
+
+
+FunctionUser = app_commands.ContextMenu(name='FunctionUser', callback=_user_function)
+FunctionMessage = app_commands.ContextMenu(name='FunctionMessage', callback=_message_function)
+ClassSlash = _make_class(0)
+FunctionSlash = _make_function(0)
+
+
+# Invocation paths, each one handles a single fresh interaction
+
+
+async def _invoke_slash(command: app_commands.Command) -> FakeInteraction:
+    interaction = FakeInteraction(OPTIONS)
+    await command._invoke_with_namespace(interaction, interaction.namespace)  # type: ignore
+    return interaction
+
+
+async def _invoke_context_menu(command: app_commands.ContextMenu) -> FakeInteraction:
+    interaction = FakeInteraction()
+    await command._invoke(interaction, TARGET)  # type: ignore
+    return interaction
+
+
+async def _invoke_autocomplete(command: app_commands.Command) -> FakeInteraction:
+    interaction = FakeInteraction(OPTIONS)
+    await command._invoke_autocomplete(interaction, 'query', interaction.namespace)  # type: ignore
+    return interaction
+
+
+INVOCATIONS: Dict[str, Dict[str, Callable[[], Awaitable[FakeInteraction]]]] = {
+    'slash': {
+        'class_commands': lambda: _invoke_slash(ClassSlash),
+        'app_commands': lambda: _invoke_slash(FunctionSlash),
+    },
+    'user': {
+        'class_commands': lambda: _invoke_context_menu(ClassUser),  # type: ignore
+        'app_commands': lambda: _invoke_context_menu(FunctionUser),
+    },
+    'message': {
+        'class_commands': lambda: _invoke_context_menu(ClassMessage),  # type: ignore
+        'app_commands': lambda: _invoke_context_menu(FunctionMessage),
+    },
+    'autocomplete': {
+        'class_commands': lambda: _invoke_autocomplete(ClassSlash),
+        'app_commands': lambda: _invoke_autocomplete(FunctionSlash),
+    },
+}
+
+
+# Benchmarks
+
+
+def bench_creation(counts: List[int], repeat: int) -> List[Result]:
+    results = []
+    for count in counts:
+        for implementation, factory in (('class_commands', _make_class), ('app_commands', _make_function)):
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for index in range(count):
+                    factory(index)
+                best = min(best, time.perf_counter() - start)
+
+            results.append(
+                {
+                    'benchmark': 'creation',
+                    'variant': 'slash',
+                    'implementation': implementation,
+                    'params': {'count': count},
+                    'seconds': best,
+                    'per_op_seconds': best / count,
+                }
+            )
+    return results
+
+
+async def bench_invocation(iterations: int, repeat: int) -> List[Result]:
+    results = []
+    for variant, implementations in INVOCATIONS.items():
+        for implementation, invoke in implementations.items():
+            await invoke()  # Warm up
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    await invoke()
+                best = min(best, time.perf_counter() - start)
+
+            results.append(
+                {
+                    'benchmark': 'invocation',
+                    'variant': variant,
+                    'implementation': implementation,
+                    'params': {'iterations': iterations},
+                    'seconds': best,
+                    'per_op_seconds': best / iterations,
+                }
+            )
+    return results
+
+
+async def bench_memory(iterations: int) -> List[Result]:
+    results = []
+    for variant, implementations in INVOCATIONS.items():
+        for implementation, invoke in implementations.items():
+            await invoke()  # Warm up caches so they are not attributed to the first invocation
+            gc.collect()
+            tracemalloc.start()
+            try:
+                # Peak measures everything an invocation allocates, retained what outlives it with the interaction
+                peak = 0
+                can_reset = hasattr(tracemalloc, 'reset_peak')  # Python 3.9+
+                kept = []
+                before = tracemalloc.get_traced_memory()[0]
+                for _ in range(iterations):
+                    if can_reset:
+                        tracemalloc.reset_peak()  # type: ignore
+                    current = tracemalloc.get_traced_memory()[0]
+                    kept.append(await invoke())
+                    peak += tracemalloc.get_traced_memory()[1] - current
+                retained = tracemalloc.get_traced_memory()[0] - before
+            finally:
+                tracemalloc.stop()
+
+            results.append(
+                {
+                    'benchmark': 'memory',
+                    'variant': variant,
+                    'implementation': implementation,
+                    'params': {'iterations': iterations},
+                    'retained_bytes': retained / iterations,
+                    'peak_bytes': peak / iterations if can_reset else None,
+                }
+            )
+    return results
+
+
+# Reporting
+
+
+def _key(result: Result) -> str:
+    params = ','.join(f'{k}={v}' for k, v in sorted(result['params'].items()) if k == 'count')
+    return '/'.join(filter(None, (result['benchmark'], result['variant'], result['implementation'], params)))
+
+
+def _value(result: Result) -> Optional[float]:
+    return result.get('per_op_seconds', result.get('retained_bytes'))
+
+
+def _format(result: Result) -> str:
+    if 'per_op_seconds' in result:
+        return f'{result["per_op_seconds"] * 1e6:12.3f} us/op'
+    peak = result['peak_bytes']
+    return f'{result["retained_bytes"]:12.1f} B retained' + (f', {peak:.1f} B peak' if peak is not None else '')
+
+
+def report(results: List[Result], baseline: Optional[Dict[str, Any]]) -> None:
+    previous = {_key(r): _value(r) for r in baseline['results']} if baseline else {}
+    for result in results:
+        key = _key(result)
+        line = f'{key:<55}{_format(result)}'
+        old, new = previous.get(key), _value(result)
+        if old and new is not None:
+            line += f'  ({new / old:.2f}x baseline)'
+        print(line, file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark discord-class-commands offline.')
+    parser.add_argument('--iterations', type=int, default=10000, help='invocations per measurement')
+    parser.add_argument('--repeat', type=int, default=5, help='measurements per benchmark, the best one is kept')
+    parser.add_argument('--quick', action='store_true', help='run a reduced number of iterations')
+    parser.add_argument('--output', help='file to write the JSON results to, defaults to stdout')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare against')
+    args = parser.parse_args()
+
+    iterations, repeat, counts = args.iterations, args.repeat, [1, 100, 1000]
+    if args.quick:
+        iterations, repeat, counts = iterations // 10, 2, [1, 100]
+
+    results = bench_creation(counts, repeat)
+    results += asyncio.run(bench_invocation(iterations, repeat))
+    results += asyncio.run(bench_memory(min(iterations, 1000)))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fp:
+            baseline = json.load(fp)
+    report(results, baseline)
+
+    data = {
+        'meta': {
+            'class_commands': class_commands.__version__,
+            'discord.py': discord.__version__,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fp:
+            json.dump(data, fp, indent=2)
+    else:
+        json.dump(data, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
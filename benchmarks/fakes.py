@@ -0,0 +1,98 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import discord
+from discord.app_commands.namespace import Namespace
+
+__all__ = (
+    'FakeInteractionResponse',
+    'FakeFollowup',
+    'FakeInteraction',
+)
+
+
+class FakeInteractionResponse:
+    """A stand-in for :class:`discord.InteractionResponse` that records responses instead of sending them."""
+
+    __slots__ = ('_done', 'responses')
+
+    def __init__(self) -> None:
+        self._done: bool = False
+        self.responses: List[Any] = []
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def send_message(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        self._done = True
+        self.responses.append(('send_message', content))
+
+    async def defer(self, **kwargs: Any) -> None:
+        self._done = True
+        self.responses.append(('defer', None))
+
+    async def autocomplete(self, choices: List[Any]) -> None:
+        self._done = True
+        self.responses.append(('autocomplete', choices))
+
+
+class FakeFollowup:
+    """A stand-in for the followup :class:`discord.Webhook` of an interaction."""
+
+    __slots__ = ('messages',)
+
+    def __init__(self) -> None:
+        self.messages: List[Any] = []
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        self.messages.append(content)
+
+
+class FakeInteraction:
+    """A stand-in for :class:`discord.Interaction` that is sufficient to invoke commands offline."""
+
+    __slots__ = ('id', 'token', 'user', 'guild_id', 'channel', 'extras', 'namespace', 'response', 'followup')
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None, *, user_id: int = 1, guild_id: int = 2) -> None:
+        self.id: int = 3
+        self.token: str = 'token'
+        self.user: discord.Object = discord.Object(id=user_id)
+        self.guild_id: int = guild_id
+        self.channel: Any = None
+        self.extras: Dict[Any, Any] = {}
+        self.namespace: Namespace = Namespace.__new__(Namespace)
+        if options:
+            self.namespace.__dict__.update(options)
+        self.response: FakeInteractionResponse = FakeInteractionResponse()
+        self.followup: FakeFollowup = FakeFollowup()
+
+    def is_expired(self) -> bool:
+        return False
+
+    async def original_message(self) -> None:
+        return None
@@ -0,0 +1,273 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+# Replays captured interaction traffic against a CommandTree offline.
+#
+# Each line of the input file is a captured INTERACTION_CREATE payload (the "d" field of the
+# gateway event), optionally wrapped as {"t": <seconds>, "d": <payload>} to give its arrival time.
+# Without "t", arrival times are taken from the interaction's snowflake ID.
+#
+# Payloads are turned into real discord.Interaction objects bound to the tree's client, and every
+# HTTP request they make goes to a stub webhook adapter with a configurable simulated latency:
+#
+#     $ python benchmarks/replay.py traffic.jsonl --tree mybot.commands:tree --time-scale 10
+#     $ python benchmarks/replay.py traffic.jsonl --tree mybot.commands:tree --rate 500 --loops 5
+
+import argparse
+import asyncio
+import importlib
+import itertools
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+from discord import app_commands
+from discord.utils import snowflake_time, time_snowflake, utcnow
+from discord.webhook.async_ import async_context
+
+Payload = Dict[str, Any]
+
+
+class StubAdapter:
+    """Stands in for discord.py's webhook adapter, which performs every interaction HTTP request."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency: float = latency
+        self.requests: Counter[str] = Counter()
+        self._ids = itertools.count(1)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        async def request(*args: Any, **kwargs: Any) -> Payload:
+            self.requests[name] += 1
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return self._message(args[0] if args else 0)
+
+        return request
+
+    def _message(self, application_id: int) -> Payload:
+        return {
+            'id': str(next(self._ids)),
+            'channel_id': '0',
+            'author': {'id': str(application_id), 'username': 'replay', 'discriminator': '0000', 'avatar': None},
+            'content': '',
+            'timestamp': '2022-01-01T00:00:00+00:00',
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': [],
+            'pinned': False,
+            'type': 0,
+        }
+
+
+class Stats:
+    __slots__ = ('latencies', 'errors')
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.errors: int = 0
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+
+        def percentile(percent: float) -> float:
+            return latencies[min(count - 1, int(count * percent / 100))] if count else 0.0
+
+        return {
+            'count': count,
+            'errors': self.errors,
+            'error_rate': self.errors / count if count else 0.0,
+            'throughput': count / elapsed if elapsed else 0.0,
+            'p50': percentile(50),
+            'p95': percentile(95),
+            'p99': percentile(99),
+            'max': latencies[-1] if count else 0.0,
+        }
+
+
+def load(path: str) -> List[Tuple[float, Payload]]:
+    entries = []
+    with open(path, encoding='utf-8') as fp:
+        for line in fp:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            if 'd' in data:
+                payload = data['d']
+                at = data.get('t')
+            else:
+                payload, at = data, None
+            if at is None:
+                at = snowflake_time(int(payload['id'])).timestamp()
+            entries.append((float(at), payload))
+
+    entries.sort(key=lambda entry: entry[0])
+    start = entries[0][0] if entries else 0.0
+    return [(at - start, payload) for at, payload in entries]
+
+
+def load_tree(target: str) -> app_commands.CommandTree:
+    # Like python -m, resolve the module relative to the working directory rather than this script
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    module, _, attribute = target.partition(':')
+    tree = getattr(importlib.import_module(module), attribute or 'tree')
+    if not isinstance(tree, app_commands.CommandTree):
+        raise TypeError(f'{target!r} is not a CommandTree')
+    return tree
+
+
+def _key(interaction: discord.Interaction) -> str:
+    command = interaction.command
+    if command is None:
+        return '<unknown>'
+    cls = getattr(command, 'cls', None)
+    kind = 'autocomplete' if interaction.type is discord.InteractionType.autocomplete else 'invoke'
+    return f'{cls.__qualname__ if cls is not None else command.qualified_name}:{kind}'
+
+
+async def dispatch(tree: app_commands.CommandTree, payload: Payload, stats: Dict[str, Stats]) -> None:
+    # Interactions expire 15 minutes after their snowflake, so every replayed one gets a fresh ID
+    payload = dict(payload, id=str(time_snowflake(utcnow())))
+    interaction = discord.Interaction(data=payload, state=tree.client._connection)  # type: ignore
+
+    failed = False
+    start = time.perf_counter()
+    try:
+        await tree._call(interaction)
+    except Exception:
+        failed = True
+    latency = time.perf_counter() - start
+
+    try:
+        key = _key(interaction)
+    except Exception:
+        key = '<unknown>'
+    entry = stats.get(key)
+    if entry is None:
+        entry = stats[key] = Stats()
+    entry.latencies.append(latency)
+    if failed or interaction.command_failed:
+        entry.errors += 1
+
+
+async def replay(
+    tree: app_commands.CommandTree,
+    entries: List[Tuple[float, Payload]],
+    *,
+    rate: Optional[float],
+    time_scale: float,
+    loops: int,
+    latency: float,
+) -> Dict[str, Any]:
+    adapter = StubAdapter(latency)
+    async_context.set(adapter)  # type: ignore # Tasks created below inherit this context
+
+    stats: Dict[str, Stats] = {}
+    tasks = []
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    offset = 0.0
+    index = 0
+    duration = entries[-1][0] if entries else 0.0
+    for _ in range(loops):
+        for at, payload in entries:
+            scheduled = index / rate if rate else offset + at / time_scale
+            delay = start + scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(dispatch(tree, payload, stats)))
+            index += 1
+        offset += duration / time_scale
+
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - start
+
+    total = Stats()
+    for entry in stats.values():
+        total.latencies += entry.latencies
+        total.errors += entry.errors
+
+    return {
+        'elapsed': elapsed,
+        'total': total.summary(elapsed),
+        'commands': {key: entry.summary(elapsed) for key, entry in sorted(stats.items())},
+        'http_requests': dict(adapter.requests),
+    }
+
+
+def report(results: Dict[str, Any]) -> None:
+    rows = [('total', results['total'])] + list(results['commands'].items())
+    print(f'{"command":<40}{"count":>8}{"err%":>8}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}', file=sys.stderr)
+    for key, row in rows:
+        print(
+            f'{key:<40}{row["count"]:>8}{row["error_rate"] * 100:>8.2f}{row["throughput"]:>10.1f}'
+            f'{row["p50"] * 1e3:>10.3f}{row["p95"] * 1e3:>10.3f}{row["p99"] * 1e3:>10.3f}',
+            file=sys.stderr,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Replay captured interactions against a CommandTree offline.')
+    parser.add_argument('payloads', help='JSON lines file of captured interaction payloads')
+    parser.add_argument('--tree', required=True, help='the CommandTree to dispatch to, as module:attribute')
+    parser.add_argument('--rate', type=float, help='dispatch at a fixed rate of interactions per second')
+    parser.add_argument('--time-scale', type=float, default=1.0, help='speed-up applied to the captured timing')
+    parser.add_argument('--loops', type=int, default=1, help='how many times to replay the file')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated HTTP latency in seconds')
+    parser.add_argument('--output', help='file to write the JSON results to, defaults to stdout')
+    args = parser.parse_args()
+
+    tree = load_tree(args.tree)
+    entries = load(args.payloads)
+    results = asyncio.run(
+        replay(tree, entries, rate=args.rate, time_scale=args.time_scale, loops=args.loops, latency=args.latency)
+    )
+    report(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fp:
+            json.dump(results, fp, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,20 @@ An extension module to facilitate class-based creation of application commands.
 :license: MIT, see LICENSE for more details.
 """
 
-__version__ = '1.1.0'
+__version__ = '1.2.0'
 
+from .autocomplete import *
 from .commands import *
+from .files import *
+from .group import *
+from .instrumentation import *
+from .message import *
 from .option import *
+from .output import *
+from .paginator import *
+from .paramcache import *
+from .pool import *
+from .ratelimit import *
+from .search import *
+from .stream import *
+from .sync import *
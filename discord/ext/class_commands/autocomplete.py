@@ -0,0 +1,225 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from operator import itemgetter
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple, Type, TypeVar
+
+if TYPE_CHECKING:
+    from discord import Interaction
+    from discord.app_commands import Choice
+
+    from .commands import Command
+
+# fmt: off
+__all__ = (
+    'AutocompleteCache',
+    'autocomplete_cache',
+)
+# fmt: on
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class AutocompleteCache:
+    """Represents a cache of autocomplete results with a size bound and an expiry time.
+
+    Results are keyed on the command, the focused option and its current value, and
+    optionally on the guild, the user and the values of the other options. The least
+    recently used result is evicted once the cache is full.
+
+    These are created with :func:`autocomplete_cache` and can be retrieved through the ``cache``
+    attribute of the decorated method.
+
+    .. versionadded:: 1.2
+
+    Attributes
+    -----------
+    ttl: :class:`float`
+        The amount of seconds results are kept for.
+    maxsize: :class:`int`
+        The maximum amount of results kept.
+    per_guild: :class:`bool`
+        Whether results are kept separately for every guild.
+    per_user: :class:`bool`
+        Whether results are kept separately for every user.
+    include_options: :class:`bool`
+        Whether results are kept separately for every combination of the other options' values.
+    hits: :class:`int`
+        The amount of lookups that returned a cached result.
+    misses: :class:`int`
+        The amount of lookups that did not.
+    evictions: :class:`int`
+        The amount of results dropped because the cache was full or they expired.
+    """
+
+    __slots__ = (
+        'ttl',
+        'maxsize',
+        'per_guild',
+        'per_user',
+        'include_options',
+        'hits',
+        'misses',
+        'evictions',
+        '_data',
+    )
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 30.0,
+        maxsize: int = 1024,
+        per_guild: bool = False,
+        per_user: bool = False,
+        include_options: bool = False,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+
+        self.ttl: float = ttl
+        self.maxsize: int = maxsize
+        self.per_guild: bool = per_guild
+        self.per_user: bool = per_user
+        self.include_options: bool = include_options
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._data: OrderedDict[Hashable, Tuple[float, List[Choice[Any]]]] = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f'<AutocompleteCache size={len(self._data)} maxsize={self.maxsize} hit_rate={self.hit_rate:.2f}>'
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_rate(self) -> float:
+        """:class:`float`: The fraction of lookups that returned a cached result."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _key(
+        self, cls: Type[Command], interaction: Interaction, focused: str, current: Any, options: Dict[str, Any]
+    ) -> Hashable:
+        # The decorated method can be shared between commands through a mixin, so the command is always part of the key
+        key: Tuple[Any, ...] = (cls, focused, current)
+        if self.per_guild:
+            key += (interaction.guild_id,)
+        if self.per_user:
+            key += (interaction.user.id,)
+        if self.include_options:
+            key += (tuple(sorted(options.items(), key=itemgetter(0))),)
+        return key
+
+    def _get(self, key: Hashable) -> Optional[List[Choice[Any]]]:
+        try:
+            expires, choices = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        if expires <= monotonic():
+            del self._data[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return choices
+
+    def _set(self, key: Hashable, choices: List[Choice[Any]]) -> None:
+        data = self._data
+        data[key] = (monotonic() + self.ttl, choices)
+        data.move_to_end(key)
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drops all cached results and resets the counters."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+def autocomplete_cache(
+    *,
+    ttl: float = 30.0,
+    maxsize: int = 1024,
+    per_guild: bool = False,
+    per_user: bool = False,
+    include_options: bool = False,
+) -> Callable[[F], F]:
+    """A decorator that caches the results of :meth:`SlashCommand.autocomplete`.
+
+    When a cached result is found, the command is not instantiated and
+    :meth:`SlashCommand.autocomplete` is not called at all.
+
+    .. versionadded:: 1.2
+
+    Example
+    --------
+
+    .. code-block:: python3
+
+        class Item(SlashCommand):
+            name: str = Option(autocomplete=True)
+
+            @autocomplete_cache(ttl=60, per_guild=True)
+            async def autocomplete(self, focused):
+                rows = await db.search_items(self.interaction.guild_id, self.name)
+                return [Choice(name=row.name, value=row.name) for row in rows]
+
+    Parameters
+    -----------
+    ttl: :class:`float`
+        The amount of seconds results are kept for. Defaults to ``30``.
+    maxsize: :class:`int`
+        The maximum amount of results kept. Defaults to ``1024``.
+    per_guild: :class:`bool`
+        Whether results should be kept separately for every guild. Defaults to ``False``.
+    per_user: :class:`bool`
+        Whether results should be kept separately for every user. Defaults to ``False``.
+    include_options: :class:`bool`
+        Whether results should be kept separately for every combination of
+        the other options' values. Defaults to ``False``.
+    """
+
+    def decorator(func: F) -> F:
+        func.cache = AutocompleteCache(  # type: ignore # Runtime attribute assignment
+            ttl=ttl,
+            maxsize=maxsize,
+            per_guild=per_guild,
+            per_user=per_user,
+            include_options=include_options,
+        )
+        return func
+
+    return decorator
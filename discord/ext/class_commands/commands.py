@@ -25,6 +25,7 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
+import functools
 import traceback
 from types import FunctionType
 
@@ -36,25 +37,47 @@ from typing import (
     List,
     TYPE_CHECKING,
     Union,
+    ClassVar,
     Sequence,
     Generic,
+    Callable,
+    Coroutine,
+    AsyncIterable,
+    Iterable,
 )
 from discord import AppCommandType, Interaction, Member, Message, User
 from discord.app_commands.commands import _shorten, Command as _Command, ContextMenu
 from discord.utils import MISSING
 
-from .interop import _generate_callback, _inject_class_based_information
+from .files import _prepare_files
+from .instrumentation import _instrumentation
+from .interop import _DEFER_KEY, _ClassCommand, _generate_callback, _inject_class_based_information, _settle_auto_defer
+from .message import LazyMessage
 from .option import _Option, ParameterData
+from .output import OutputBuffer
+from .paginator import Paginator
+from .pool import InstancePool
+from .stream import ResponseStream
 
 if TYPE_CHECKING:
-    from discord import AllowedMentions, File, Embed, Permissions
+    from discord import AllowedMentions, Embed, Permissions
     from discord.ui import View
     from discord.abc import Snowflake
     from discord.app_commands.commands import AppCommandError, Choice, ChoiceT, Group
 
-__all__ = ('Command', 'UserCommand', 'MessageCommand', 'SlashCommand')
+    from .files import FileSource
+    from .instrumentation import Histogram
+    from .ratelimit import SendQueue
+    from .search import ChoiceIndex
+
+__all__ = ('Command', 'UserCommand', 'MessageCommand', 'SlashCommand', 'interaction_cached')
 
 CommandT = TypeVar('CommandT', bound='Command')
+T = TypeVar('T')
+
+_CACHE_KEY = '__discord_class_commands_cache__'
+# Public class attributes that are part of the command rather than options
+_RESERVED = frozenset({'interaction', 'send_queue'})
 
 
 if TYPE_CHECKING:
@@ -65,15 +88,24 @@ else:
 
 class CommandMeta(type, meta):
     __discord_app_commands_type__: AppCommandType = MISSING
+    __discord_app_commands_pool__: Optional[InstancePool] = None
+    __discord_app_commands_autocomplete_timeout__: Optional[float] = None
+    __discord_app_commands_autocomplete_cancel_stale__: bool = False
+    __discord_app_commands_auto_defer__: Optional[float] = None
+    __discord_app_commands_auto_defer_ephemeral__: bool = False
+    __discord_app_commands_lazy__: bool = False
     if TYPE_CHECKING:
         __discord_app_commands_params__: List[ParameterData]
         __discord_app_commands_param_description__: Dict[str, str]
         __discord_app_commands_param_rename__: Dict[str, str]
         __discord_app_commands_param_choices__: Dict[str, List[Choice]]
         __discord_app_commands_param_autocompleted__: List[str]
+        __discord_app_commands_param_sources__: Dict[str, ChoiceIndex]
         __discord_app_commands_param_autocomplete__: Dict[str, Any]
+        __discord_app_commands_param_modules__: Dict[str, str]
         __discord_app_commands_guild_only__: bool
         __discord_app_commands_default_permissions__: Optional[Permissions]
+        __discord_app_commands_slotted__: bool
 
     def __new__(
         cls,
@@ -89,6 +121,14 @@ class CommandMeta(type, meta):
         guild_only: bool = MISSING,
         default_permissions: Optional[Permissions] = MISSING,
         nsfw: bool = False,
+        slots: bool = False,
+        pooled: bool = False,
+        pool_size: int = 16,
+        autocomplete_timeout: Optional[float] = None,
+        cancel_stale_autocomplete: bool = False,
+        auto_defer: Optional[float] = None,
+        auto_defer_ephemeral: bool = False,
+        lazy: bool = False,
     ) -> Union[_Command, ContextMenu]:
         if not bases or bases == (Command, Generic):  # This metaclass should only operate on subclasses
             return super().__new__(cls, classname, bases, attrs)
@@ -109,32 +149,64 @@ class CommandMeta(type, meta):
         renames = {}
         extra_choices = {}
         autocompleted = []
-
-        annotations = attrs.get('__annotations__', {})
-        for k, v in attrs.items():
-            if k.startswith('_') or k == 'interaction' or type(v) in {FunctionType, classmethod, staticmethod}:
+        sources = {}
+        param_modules = {}
+
+        # Options can be shared between commands through plain mixin classes, the class's own options take precedence.
+        # Only explicit Options are taken from mixins, anything else on them stays a regular class attribute.
+        options = {}
+        annotations = {}
+        modules = {}
+        for base in reversed(bases):
+            for mixin in reversed(base.__mro__):
+                if isinstance(mixin, CommandMeta) or mixin.__module__ in {'builtins', 'typing'}:
+                    continue
+                mixin_annotations = mixin.__dict__.get('__annotations__', {})
+                for k, v in mixin.__dict__.items():
+                    if isinstance(v, _Option):
+                        options[k] = v
+                        modules[k] = mixin.__module__
+                        if k in mixin_annotations:
+                            annotations[k] = mixin_annotations[k]
+                    elif k in options:
+                        # Overridden by a regular attribute further down the hierarchy
+                        del options[k]
+                        del modules[k]
+
+        options.update(attrs)
+        annotations.update(attrs.get('__annotations__', {}))
+        for k in attrs:
+            modules.pop(k, None)
+
+        for k, v in options.items():
+            if k.startswith('_') or k in _RESERVED or type(v) in {FunctionType, classmethod, staticmethod}:
                 continue
 
             annotation = annotations.get(k, 'str')
             autocomplete = False
-            _name = default = _description = choices = MISSING
+            _name = default = _description = choices = source = MISSING
             if isinstance(v, _Option):
                 _name = v.name
                 default = v.default
                 _description = v.description
                 choices = v.choices
                 autocomplete = v.autocomplete
+                source = v.source
             elif v is not MISSING:
                 default = v
 
             arguments.append(ParameterData(k, default, annotation))
+            if k in modules:
+                param_modules[k] = modules[k]
             if _name is not MISSING:
                 renames[k] = _name
             if _description is not MISSING:
                 descriptions[k] = _description
             if choices is not MISSING:
                 extra_choices[k] = choices
-            if autocomplete:
+            if source is not MISSING:
+                sources[k] = source
+            elif autocomplete:
                 autocompleted.append(k)
 
         if type in {AppCommandType.user, AppCommandType.message} and len(arguments) > 1:
@@ -148,13 +220,38 @@ class CommandMeta(type, meta):
             attrs['__discord_app_commands_param_choices__'] = extra_choices
         if autocompleted:
             attrs['__discord_app_commands_param_autocompleted__'] = autocompleted
+        if sources:
+            attrs['__discord_app_commands_param_sources__'] = sources
+        if param_modules:
+            attrs['__discord_app_commands_param_modules__'] = param_modules
         if guild_only is not MISSING:
             attrs['__discord_app_commands_guild_only__'] = guild_only
         if default_permissions is not MISSING:
             attrs['__discord_app_commands_default_permissions__'] = default_permissions
+        if autocomplete_timeout is not None:
+            attrs['__discord_app_commands_autocomplete_timeout__'] = autocomplete_timeout
+        if cancel_stale_autocomplete:
+            attrs['__discord_app_commands_autocomplete_cancel_stale__'] = True
+        if auto_defer is not None:
+            attrs['__discord_app_commands_auto_defer__'] = auto_defer
+        if auto_defer_ephemeral:
+            attrs['__discord_app_commands_auto_defer_ephemeral__'] = True
+        if lazy:
+            attrs['__discord_app_commands_lazy__'] = True
+        if slots:
+            # Options become slots, so their class attributes have to go
+            for param in arguments:
+                attrs.pop(param.name, None)
+            extra_slots = attrs.get('__slots__', ())
+            if isinstance(extra_slots, str):
+                extra_slots = (extra_slots,)
+            attrs['__slots__'] = (*extra_slots, *(param.name for param in arguments))
+            attrs['__discord_app_commands_slotted__'] = True
 
         # After all of that, we turn the class into a Command
         sub = super().__new__(cls, classname, bases, attrs)
+        if pooled:
+            sub.__discord_app_commands_pool__ = InstancePool(sub, pool_size)
 
         if sub.__discord_app_commands_type__ is AppCommandType.chat_input:
             if description is MISSING:
@@ -164,7 +261,7 @@ class CommandMeta(type, meta):
                 else:
                     description = _shorten(docstring)
 
-            command = _Command(
+            command = _ClassCommand(
                 name=name if name is not MISSING else classname.lower(),
                 description=description,
                 callback=_generate_callback(sub, fake=True),  # type: ignore # The cls type is correct
@@ -190,13 +287,78 @@ class CommandMeta(type, meta):
         """:class:`~discord.AppCommandType`: Returns the command's type."""
         return cls.__discord_app_commands_type__
 
+    @property
+    def pool(cls) -> Optional[InstancePool]:
+        """Optional[:class:`InstancePool`]: Returns the command's instance pool, if it is pooled.
+
+        .. versionadded:: 1.2
+        """
+        return cls.__discord_app_commands_pool__
+
+    def stats(cls) -> Dict[str, Histogram]:
+        """Returns the recorded latencies of the command.
+
+        This is only populated while instrumentation is enabled through
+        :func:`enable_instrumentation`.
+
+        .. versionadded:: 1.2
+
+        Returns
+        --------
+        Dict[:class:`str`, :class:`Histogram`]
+            A mapping of phase names to their histogram.
+        """
+        return _instrumentation.histograms.get(cls, {}).copy()  # type: ignore # cls is a Command class here
+
+
+def interaction_cached(func: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., Coroutine[Any, Any, T]]:
+    """A decorator that caches the result of a coroutine method for the lifetime of the interaction.
+
+    As the same command instance is shared between :meth:`Command.check`, :meth:`Command.callback`
+    and :meth:`Command.on_error`, this can be used to make sure expensive lookups (such as
+    fetching configuration from a database) only run once per interaction.
+
+    Results are cached per set of arguments, which must be hashable.
+
+    .. versionadded:: 1.2
+
+    Example
+    --------
+
+    .. code-block:: python3
+
+        class Ban(SlashCommand):
+            @interaction_cached
+            async def config(self):
+                return await db.fetch_config(self.interaction.guild_id)
+
+            async def check(self):
+                return (await self.config()).bans_enabled
+
+            async def callback(self):
+                ...  # self.config() does not hit the database again
+    """
+
+    @functools.wraps(func)
+    async def wrapped(self: Command, *args: Any, **kwargs: Any) -> T:
+        cache = self.interaction.extras.setdefault(_CACHE_KEY, {})
+        key = (func, args, tuple(kwargs.items())) if kwargs else (func, args)
+        try:
+            return cache[key]
+        except KeyError:
+            ret = cache[key] = await func(self, *args, **kwargs)
+            return ret
+
+    return wrapped
+
 
 class Command(metaclass=CommandMeta):
     """Represents a class-based application command.
 
     .. note::
 
-        Instances of this class are created on every command invocation.
+        Instances of this class are created once per interaction and shared between
+        :meth:`check`, :meth:`callback`, :meth:`SlashCommand.autocomplete` and :meth:`on_error`.
 
         This means that relying on the state of this class to be
         the same between command invocations would not work as expected.
@@ -239,15 +401,90 @@ class Command(metaclass=CommandMeta):
         Due to a Discord limitation, this does not work on subcommands.
 
         .. versionadded:: 1.1
+    slots: :class:`bool`
+        Whether instances of the command should use ``__slots__`` for their options
+        instead of an instance dictionary. This lowers the memory used per invocation
+        and speeds up attribute access. Defaults to ``False``.
+
+        Setting attributes other than the options, :attr:`interaction` and ``target``
+        on a slotted instance requires declaring them in ``__slots__`` in the class body.
+
+        .. versionadded:: 1.2
+    pooled: :class:`bool`
+        Whether instances of the command should be reused between interactions
+        through an :class:`InstancePool` instead of being created every time.
+        Instances are reset before being reused. Defaults to ``False``.
+
+        .. warning::
+
+            Pooled instances must not be referenced after the interaction is
+            over, for example by a view or a background task.
+
+        .. versionadded:: 1.2
+    pool_size: :class:`int`
+        The maximum amount of idle instances kept by the pool. Defaults to ``16``.
+
+        .. versionadded:: 1.2
+    autocomplete_timeout: Optional[:class:`float`]
+        The amount of seconds :meth:`SlashCommand.autocomplete` may take before it is cancelled
+        and the latest partial results, or else the last results shown to the same user for the
+        same option, are returned instead. Defaults to ``None``, meaning no time limit.
+
+        Discord discards autocomplete responses given after 3 seconds.
+
+        .. versionadded:: 1.2
+    cancel_stale_autocomplete: :class:`bool`
+        Whether :meth:`SlashCommand.autocomplete` should be cancelled once the same user
+        triggers autocomplete for the same option again. The superseded interaction is
+        left unanswered, as Discord discards its response anyway. Defaults to ``False``.
+
+        .. versionadded:: 1.2
+    auto_defer: Optional[:class:`float`]
+        The amount of seconds after which the interaction is automatically deferred
+        if :meth:`Command.callback` has not responded to it yet, so that :meth:`Command.send`
+        sends followups instead of falling back to the channel once the interaction expires.
+        Defaults to ``None``, meaning the interaction is never deferred automatically.
+
+        The delay is measured from when the interaction was created, so time spent in checks
+        and transformers counts towards it. Discord requires a response within 3 seconds,
+        so this should leave some margin.
+
+        Calling :meth:`Command.defer` waits for an automatic defer that is in flight, and
+        does nothing if the interaction was already deferred automatically.
+
+        .. versionadded:: 1.2
+    auto_defer_ephemeral: :class:`bool`
+        Whether the automatic defer should be ephemeral. This decides whether the
+        response to the interaction is ephemeral. Defaults to ``False``.
+
+        .. versionadded:: 1.2
+    lazy: :class:`bool`
+        Whether resolving the annotations, descriptions and choices of the options should
+        be put off until they are first needed, such as when syncing or on the first invocation,
+        instead of happening when the class is defined. This speeds up importing commands
+        that are not synced by the process. Only applies to slash commands. Defaults to ``False``.
+
+        Invalid options are only reported once they are resolved.
+
+        .. versionadded:: 1.2
 
 
     Attributes
     -----------
     interaction: :class:`~discord.Interaction`
         The interaction that triggered the command.
+    send_queue: Optional[:class:`SendQueue`]
+        The queue that paces the followups and channel messages sent by :meth:`send`.
+        Defaults to ``None``, meaning messages are sent right away. Assign a queue in
+        the class body to opt in; the same queue can be shared between commands.
+
+        .. versionadded:: 1.2
     """
 
+    __slots__ = ('interaction',)
+
     interaction: Interaction
+    send_queue: ClassVar[Optional[SendQueue]] = None
 
     async def callback(self) -> None:
         """|coro|
@@ -294,14 +531,15 @@ class Command(metaclass=CommandMeta):
         tts: bool = False,
         embed: Optional[Embed] = None,
         embeds: Optional[Sequence[Embed]] = None,
-        file: Optional[File] = None,
-        files: Optional[Sequence[File]] = None,
+        file: Optional[FileSource] = None,
+        files: Optional[Sequence[FileSource]] = None,
         nonce: Optional[Union[str, int]] = None,
         allowed_mentions: Optional[AllowedMentions] = None,
         view: Optional[View] = None,
         suppress_embeds: bool = False,
         ephemeral: bool = False,
-    ) -> Message:
+        fetch: bool = True,
+    ) -> Union[Message, LazyMessage]:
         """|coro|
 
         Responds to the interaction with the content given.
@@ -309,9 +547,13 @@ class Command(metaclass=CommandMeta):
         This does one of the following:
 
         - :meth:`~discord.InteractionResponse.send_message` if no response has been given.
+          A :class:`LazyMessage` is returned in this case if ``fetch`` is ``False``.
         - A followup message if a response has been given.
         - Regular send if the interaction has expired
 
+        .. versionchanged:: 1.2
+            Followups and regular sends are paced by :attr:`send_queue`, if set.
+
         Parameters
         ------------
         content: Optional[:class:`str`]
@@ -320,10 +562,16 @@ class Command(metaclass=CommandMeta):
             Indicates if the message should be sent using text-to-speech.
         embed: :class:`~discord.Embed`
             The rich embed for the content.
-        file: :class:`~discord.File`
-            The file to upload.
-        files: List[:class:`~discord.File`]
+        file: Union[:class:`~discord.File`, :class:`str`, :class:`io.IOBase`, AsyncIterable[:class:`bytes`]]
+            The file to upload. See :func:`prepare_file` for how each kind of file is handled.
+
+            .. versionchanged:: 1.2
+                Paths, buffers and asynchronous iterators of bytes are accepted.
+        files: List[Union[:class:`~discord.File`, :class:`str`, :class:`io.IOBase`, AsyncIterable[:class:`bytes`]]]
             A list of files to upload. Must be a maximum of 10.
+
+            .. versionchanged:: 1.2
+                Paths, buffers and asynchronous iterators of bytes are accepted.
         nonce: :class:`int`
             The nonce to use for sending this message. If the message was successfully sent,
             then the message will have a nonce with this value.
@@ -344,6 +592,13 @@ class Command(metaclass=CommandMeta):
             Indicates if the message should only be visible to the user who started the interaction.
             If a view is sent with an ephemeral message and it has no timeout set then the timeout
             is set to 15 minutes.
+        fetch: :class:`bool`
+            Whether to retrieve the message right away when responding to the interaction.
+            Retrieving it costs an additional request. If ``False``, a :class:`LazyMessage`
+            is returned instead, which retrieves the message only once it is needed.
+            Defaults to ``True``.
+
+            .. versionadded:: 1.2
 
         Raises
         --------
@@ -353,21 +608,41 @@ class Command(metaclass=CommandMeta):
             You do not have the proper permissions to send the message.
         ValueError
             The ``files`` list is not of the appropriate size.
+        FileTooLarge
+            The files are larger than the upload limit of the guild.
+            This is checked before anything is uploaded.
         TypeError
             You specified both ``file`` and ``files``,
             or you specified both ``embed`` and ``embeds``,
             or the ``reference`` object is not a :class:`~discord.Message`,
             :class:`~discord.MessageReference` or :class:`~discord.PartialMessage`.
 
+        .. versionchanged:: 1.2
+            A :class:`LazyMessage` is returned when responding to the interaction with ``fetch=False``.
+
         Returns
         ---------
-        :class:`~discord.Message`
+        Union[:class:`~discord.Message`, :class:`LazyMessage`]
             The message that was sent.
         """
         interaction = self.interaction
+        # Preparing files can take a while, so the automatic defer stays armed until they are ready
+        if file is not None:
+            file = (await _prepare_files(interaction, (file,)))[0]
+        elif files is not None:
+            files = await _prepare_files(interaction, files)
+
+        if _DEFER_KEY in interaction.extras:
+            await _settle_auto_defer(interaction)
+
+        measure = _instrumentation.measure
+        cls = type(self)
+        queue = self.send_queue
 
         if interaction.is_expired():
-            return await interaction.channel.send(  # type: ignore # Should always support send in this context
+            channel = interaction.channel
+            send = functools.partial(
+                channel.send,  # type: ignore # Should always support send in this context
                 content=content,
                 tts=tts,
                 embed=embed,
@@ -379,6 +654,10 @@ class Command(metaclass=CommandMeta):
                 view=view,
                 suppress_embeds=suppress_embeds,
             )
+            if queue is None:
+                return await measure(cls, 'send', send())
+            async with queue.reserve(channel):  # type: ignore # Same as above
+                return await measure(cls, 'send', send())
 
         # Convert the kwargs from None to MISSING to appease the remaining implementations
         kwargs = {
@@ -395,10 +674,135 @@ class Command(metaclass=CommandMeta):
         }
 
         if interaction.response.is_done():
-            return await interaction.followup.send(**kwargs, wait=True)
+            if queue is None:
+                return await measure(cls, 'send', interaction.followup.send(**kwargs, wait=True))
+            async with queue.reserve(interaction):
+                return await measure(cls, 'send', interaction.followup.send(**kwargs, wait=True))
+
+        await measure(cls, 'send', interaction.response.send_message(**kwargs))
+        if fetch:
+            return await measure(cls, 'original_message', interaction.original_message())
+        return LazyMessage(interaction)
+
+    def output(self, *, ephemeral: bool = False, allowed_mentions: Optional[AllowedMentions] = None) -> OutputBuffer:
+        """Returns a buffered writer that merges output into as few messages as possible.
+
+        This is preferable to calling :meth:`send` many times in a row,
+        as every call is a separate request. The writer is meant to be used
+        as an asynchronous context manager:
+
+        .. code-block:: python3
 
-        await interaction.response.send_message(**kwargs)
-        return await interaction.original_message()
+            async with self.output() as out:
+                for item in items:
+                    out.write(f'{item}\\n')
+
+        .. versionadded:: 1.2
+
+        Parameters
+        -----------
+        ephemeral: :class:`bool`
+            Whether the messages should only be visible to the user who started the interaction.
+        allowed_mentions: :class:`~discord.AllowedMentions`
+            Controls the mentions being processed in the messages.
+
+        Returns
+        --------
+        :class:`OutputBuffer`
+            The buffered writer.
+        """
+        return OutputBuffer(self, ephemeral=ephemeral, allowed_mentions=allowed_mentions)
+
+    def stream(self, *, interval: float = 1.0, ephemeral: bool = False) -> ResponseStream:
+        """Returns a response that is edited as its content changes, at a limited rate.
+
+        This is useful to report the progress of long-running commands without
+        being rate limited. The stream is meant to be used as an asynchronous
+        context manager:
+
+        .. code-block:: python3
+
+            async with self.stream() as stream:
+                for index, item in enumerate(items, 1):
+                    await process(item)
+                    await stream.update(f'Processed {index}/{len(items)} items')
+
+        .. versionadded:: 1.2
+
+        Parameters
+        -----------
+        interval: :class:`float`
+            The minimum amount of seconds between edits. Defaults to ``1``.
+        ephemeral: :class:`bool`
+            Whether the messages should only be visible to the user who started the interaction.
+
+        Returns
+        --------
+        :class:`ResponseStream`
+            The stream.
+        """
+        return ResponseStream(self, interval=interval, ephemeral=ephemeral)
+
+    async def paginate(
+        self,
+        source: Union[AsyncIterable[T], Iterable[T]],
+        *,
+        per_page: int = 10,
+        formatter: Callable[[T], Any] = str,
+        timeout: Optional[float] = 180.0,
+        empty: str = 'Nothing to show.',
+        ephemeral: bool = False,
+    ) -> Paginator[T]:
+        """|coro|
+
+        Sends the rows of a source a page at a time, with buttons to navigate between pages.
+
+        Rows are only pulled from the source when the user asks for the next page,
+        so large results never have to be held in memory at once:
+
+        .. code-block:: python3
+
+            async def callback(self):
+                entries = self.interaction.guild.audit_logs(limit=None)
+                await self.paginate(entries, formatter=lambda e: f'{e.user}: {e.action.name}')
+
+        .. versionadded:: 1.2
+
+        Parameters
+        -----------
+        source: Union[AsyncIterable, Iterable]
+            The rows to paginate. This can be an asynchronous iterator or generator.
+        per_page: :class:`int`
+            The maximum amount of rows per page. Defaults to ``10``.
+        formatter: Callable[[Any], :class:`str`]
+            The function turning a row into a line of text. Defaults to :class:`str`.
+        timeout: Optional[:class:`float`]
+            The amount of seconds without interaction after which the buttons are removed.
+            Defaults to ``180``.
+        empty: :class:`str`
+            The content to send if the source has no rows.
+        ephemeral: :class:`bool`
+            Whether the message should only be visible to the user who started the interaction.
+
+        Raises
+        -------
+        ~discord.HTTPException
+            Sending the message failed.
+
+        Returns
+        --------
+        :class:`Paginator`
+            The paginator attached to the message.
+        """
+        paginator = Paginator(
+            source, user_id=self.interaction.user.id, per_page=per_page, formatter=formatter, timeout=timeout
+        )
+        content = await paginator.start()
+        if not content:
+            paginator.message = await self.send(empty, ephemeral=ephemeral, fetch=False)
+        else:
+            paginator.message = await self.send(content, view=paginator, ephemeral=ephemeral, fetch=False)
+        return paginator
 
     async def defer(self, *, ephemeral: bool = False) -> None:
         """|coro|
@@ -413,6 +817,10 @@ class Command(metaclass=CommandMeta):
         ephemeral: :class:`bool`
             Indicates whether the deferred message will eventually be ephemeral.
 
+        .. versionchanged:: 1.2
+            Does nothing if the interaction was already deferred automatically
+            because of the ``auto_defer`` class parameter.
+
         Raises
         -------
         ~discord.HTTPException
@@ -420,7 +828,10 @@ class Command(metaclass=CommandMeta):
         ~discord.InteractionResponded
             This interaction has already been responded to before.
         """
-        await self.interaction.response.defer(ephemeral=ephemeral)
+        interaction = self.interaction
+        if _DEFER_KEY in interaction.extras and await _settle_auto_defer(interaction):
+            return
+        await interaction.response.defer(ephemeral=ephemeral)
 
 
 class SlashCommand(Command, Generic[CommandT]):
@@ -428,7 +839,8 @@ class SlashCommand(Command, Generic[CommandT]):
 
     .. note::
 
-        Instances of this class are created on every command invocation.
+        Instances of this class are created once per interaction and shared between
+        :meth:`~Command.check`, :meth:`~Command.callback`, :meth:`autocomplete` and :meth:`~Command.on_error`.
 
         This means that relying on the state of this class to be
         the same between command invocations would not work as expected.
@@ -466,6 +878,8 @@ class SlashCommand(Command, Generic[CommandT]):
 
     """
 
+    __slots__ = ()
+
     __discord_app_commands_type__ = AppCommandType.chat_input
 
     async def autocomplete(self, focused: str) -> List[Choice[ChoiceT]]:
@@ -483,10 +897,21 @@ class SlashCommand(Command, Generic[CommandT]):
 
             This is a Discord limitation.
 
+        This can also be an asynchronous generator yielding increasingly complete lists
+        of choices, in which case the last one is used. If the ``autocomplete_timeout``
+        class parameter is exceeded, the latest list yielded so far is used instead.
+
+        .. versionchanged:: 1.2
+            This can be an asynchronous generator.
+
         Parameters
         -----------
         focused: :class:`str`
-            The name of the option that is currently focused.
+            The attribute name of the option that is currently focused.
+            This is not affected by :attr:`Option.name`.
+
+            .. versionchanged:: 1.2
+                This is now always the focused option, even if other options have the same value.
 
         Returns
         --------
@@ -501,7 +926,8 @@ class UserCommand(Command, Generic[CommandT]):
 
     .. note::
 
-        Instances of this class are created on every command invocation.
+        Instances of this class are created once per interaction and shared between
+        :meth:`~Command.check`, :meth:`~Command.callback` and :meth:`~Command.on_error`.
 
         This means that relying on the state of this class to be
         the same between command invocations would not work as expected.
@@ -537,6 +963,8 @@ class UserCommand(Command, Generic[CommandT]):
         The user that the command is executed on.
     """
 
+    __slots__ = ('target',)
+
     __discord_app_commands_type__ = AppCommandType.user
     target: Union[Member, User]
 
@@ -546,7 +974,8 @@ class MessageCommand(Command, Generic[CommandT]):
 
     .. note::
 
-        Instances of this class are created on every command invocation.
+        Instances of this class are created once per interaction and shared between
+        :meth:`~Command.check`, :meth:`~Command.callback` and :meth:`~Command.on_error`.
 
         This means that relying on the state of this class to be
         the same between command invocations would not work as expected.
@@ -582,5 +1011,7 @@ class MessageCommand(Command, Generic[CommandT]):
         The message that the command is executed on.
     """
 
+    __slots__ = ('target',)
+
     __discord_app_commands_type__ = AppCommandType.message
     target: Message
@@ -0,0 +1,169 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+from typing import TYPE_CHECKING, AsyncIterable, List, Optional, Sequence, Union
+
+from discord import File
+
+if TYPE_CHECKING:
+    from discord import Interaction
+
+    FileSource = Union[File, str, 'os.PathLike[str]', io.IOBase, AsyncIterable[bytes]]
+
+# fmt: off
+__all__ = (
+    'FileTooLarge',
+    'prepare_file',
+)
+# fmt: on
+
+DEFAULT_FILESIZE_LIMIT = 8 * 1024 * 1024
+DEFAULT_SPOOL_SIZE = 1024 * 1024
+
+
+class FileTooLarge(ValueError):
+    """An exception raised when the files to upload exceed the upload limit.
+
+    This is raised before the upload starts.
+
+    .. versionadded:: 1.2
+
+    Attributes
+    -----------
+    size: :class:`int`
+        The size of the files, in bytes. For asynchronous iterators this is
+        the amount of bytes read until the limit was exceeded.
+    limit: :class:`int`
+        The upload limit, in bytes.
+    """
+
+    def __init__(self, size: int, limit: int) -> None:
+        self.size: int = size
+        self.limit: int = limit
+        super().__init__(f'Files are too large to upload ({size} bytes, the limit is {limit} bytes)')
+
+
+def _remaining_size(fp: io.IOBase) -> Optional[int]:
+    # Only the bytes after the current position are uploaded
+    try:
+        position = fp.tell()
+        end = fp.seek(0, os.SEEK_END)
+        fp.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+    return end - position
+
+
+async def prepare_file(
+    source: FileSource,
+    *,
+    filename: Optional[str] = None,
+    limit: Optional[int] = None,
+    spool_size: int = DEFAULT_SPOOL_SIZE,
+) -> File:
+    """|coro|
+
+    Turns a file path, a binary buffer or an asynchronous iterator of bytes into a :class:`~discord.File`.
+
+    Paths are opened rather than read, so they are streamed from disk while uploading.
+    Asynchronous iterators are consumed into memory up to ``spool_size`` bytes, and into
+    a temporary file on disk past that.
+
+    :meth:`Command.send` calls this for every file it is given that is not a :class:`~discord.File` already.
+
+    .. versionadded:: 1.2
+
+    Parameters
+    -----------
+    source: Union[:class:`~discord.File`, :class:`str`, :class:`io.IOBase`, AsyncIterable[:class:`bytes`]]
+        The file to upload. Paths can also be :class:`os.PathLike`. Buffers must be readable and seekable.
+    filename: Optional[:class:`str`]
+        The filename to upload the file as. Defaults to the name of the path or buffer.
+    limit: Optional[:class:`int`]
+        The maximum size of the file in bytes. Checked before anything is uploaded.
+    spool_size: :class:`int`
+        The amount of bytes from an asynchronous iterator that are kept in memory. Defaults to 1 MiB.
+
+    Raises
+    -------
+    FileTooLarge
+        The file is larger than ``limit``.
+
+    Returns
+    --------
+    :class:`~discord.File`
+        The file.
+    """
+    if isinstance(source, File):
+        file = source
+    elif isinstance(source, AsyncIterable):
+        size = 0
+        buffer: io.IOBase = io.BytesIO()
+        async for chunk in source:
+            size += len(chunk)
+            if limit is not None and size > limit:
+                buffer.close()
+                raise FileTooLarge(size, limit)
+            if size > spool_size and isinstance(buffer, io.BytesIO):
+                spooled = tempfile.TemporaryFile()
+                spooled.write(buffer.getbuffer())
+                buffer = spooled  # type: ignore # TemporaryFile is a buffered binary file
+            buffer.write(chunk)  # type: ignore # Both buffers are writable
+        buffer.seek(0)
+        file = File(buffer, filename or 'untitled')  # type: ignore # Same as above
+        file._owner = True  # The buffer is ours, so it is closed along with the file
+        return file
+    else:
+        file = File(source, filename)  # type: ignore # Anything else is handled by File itself
+
+    if limit is not None:
+        size = _remaining_size(file.fp)
+        if size is not None and size > limit:
+            file.close()
+            raise FileTooLarge(size, limit)
+    return file
+
+
+async def _prepare_files(interaction: Interaction, sources: Sequence[FileSource]) -> List[File]:
+    guild = interaction.guild
+    limit = guild.filesize_limit if guild is not None else DEFAULT_FILESIZE_LIMIT
+
+    files: List[File] = []
+    try:
+        for source in sources:
+            file = await prepare_file(source, limit=limit)
+            files.append(file)
+            limit -= _remaining_size(file.fp) or 0
+    except FileTooLarge as exc:
+        # Report the size of everything together
+        total = exc.size + sum(_remaining_size(file.fp) or 0 for file in files)
+        for file in files:
+            file.close()
+        raise FileTooLarge(total, exc.limit + total - exc.size) from None
+    return files
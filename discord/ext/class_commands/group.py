@@ -0,0 +1,222 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Type, Union
+
+from discord.app_commands import Command as _Command, Group
+from discord.app_commands.commands import _shorten
+from discord.utils import MISSING
+
+if TYPE_CHECKING:
+    from discord import Permissions
+    from discord.abc import Snowflake
+
+    from .commands import SlashCommand
+
+# fmt: off
+__all__ = (
+    'SlashGroup',
+)
+# fmt: on
+
+
+class _ClassGroup(Group):
+    # The group that class-based groups turn into, with the routes of every subcommand below it
+    cls: Type[SlashGroup]
+    routes: Dict[str, Type[SlashCommand[Any]]]
+
+    def _build_routes(self) -> None:
+        # Qualified names change when a group gets a parent, so nested groups are rebuilt along with it
+        routes = {}
+        for child in self._children.values():
+            if isinstance(child, _ClassGroup):
+                child._build_routes()
+                routes.update(child.routes)
+            elif isinstance(child, Group):
+                for command in child._children.values():
+                    cls = getattr(command, 'cls', None)
+                    if cls is not None:
+                        routes[command.qualified_name] = cls
+            else:
+                cls = getattr(child, 'cls', None)
+                if cls is not None:
+                    routes[child.qualified_name] = cls
+        self.routes = routes
+
+    def _rebuild_routes(self) -> None:
+        # A change anywhere in the tree shows up in the routes of every class-based group above it
+        root = self
+        while isinstance(root.parent, _ClassGroup):
+            root = root.parent
+        root._build_routes()
+
+    def get_route(self, qualified_name: str) -> Optional[Type[SlashCommand[Any]]]:
+        return self.routes.get(qualified_name)
+
+    def add_command(self, command: Union[_Command[Any, ..., Any], Group], /, *, override: bool = False) -> None:
+        super().add_command(command, override=override)
+        self._rebuild_routes()
+
+    def remove_command(self, name: str, /) -> Optional[Union[_Command[Any, ..., Any], Group]]:
+        command = self._children.get(name)
+        super().remove_command(name)
+        self._rebuild_routes()
+        return command
+
+    def _copy_with(self, **kwargs: Any) -> Any:
+        copy = super()._copy_with(**kwargs)
+        copy.cls = self.cls
+        copy._rebuild_routes()
+        return copy
+
+
+class GroupMeta(type):
+    def __new__(
+        cls,
+        classname: str,
+        bases: tuple,
+        attrs: Dict[str, Any],
+        *,
+        name: str = MISSING,
+        description: str = MISSING,
+        guild: Optional[Snowflake] = MISSING,
+        guilds: Sequence[Snowflake] = MISSING,
+        parent: Optional[Group] = MISSING,
+        guild_only: bool = MISSING,
+        default_permissions: Optional[Permissions] = MISSING,
+        nsfw: bool = False,
+    ) -> Any:
+        if not bases:  # This metaclass should only operate on subclasses
+            return super().__new__(cls, classname, bases, attrs)
+
+        if guild is not MISSING and guilds is not MISSING:
+            raise TypeError('Cannot mix guild and guilds keyword arguments')
+
+        if guild:
+            guild_ids = [guild.id]
+        elif guilds:
+            guild_ids = [g.id for g in guilds]
+        else:
+            guild_ids = None
+
+        if description is MISSING:
+            docstring = attrs.get('__doc__')
+            description = '…' if docstring is None else _shorten(docstring)
+
+        # Nested classes are created before the class containing them, so they are already commands and groups by now
+        children: List[Any] = [v for v in attrs.values() if isinstance(v, (_Command, Group))]
+        for child in children:
+            if isinstance(child, Group) and any(isinstance(c, Group) for c in child._children.values()):
+                raise ValueError(f'{child.name!r} is too nested, groups can only be nested at most one level')
+
+        sub = super().__new__(cls, classname, bases, attrs)
+        group = _ClassGroup(
+            name=name if name is not MISSING else classname.lower(),
+            description=description,
+            parent=parent or None,
+            guild_ids=guild_ids,
+            guild_only=guild_only if guild_only is not MISSING else False,
+            default_permissions=default_permissions if default_permissions is not MISSING else None,
+            nsfw=nsfw,
+        )
+        group.cls = sub
+        group.routes = {}
+        for child in children:
+            group.add_command(child)
+        return group
+
+
+class SlashGroup(metaclass=GroupMeta):
+    """Represents a class-based slash command group.
+
+    Slash commands and groups nested inside the class become its subcommands,
+    so a whole tree of commands can be declared in one place:
+
+    .. code-block:: python3
+
+        class Tag(SlashGroup):
+            \"\"\"Manage tags.\"\"\"
+
+            class Create(SlashCommand):
+                \"\"\"Create a tag.\"\"\"
+                name: str
+                content: str
+
+            class Alias(SlashGroup):
+                \"\"\"Manage tag aliases.\"\"\"
+
+                class Add(SlashCommand):
+                    ...
+
+    Subclassing this turns the class into an :class:`~discord.app_commands.Group`,
+    which can be added to a :class:`~discord.app_commands.CommandTree` like any other group.
+    Every group additionally has a ``routes`` attribute, a flat mapping of the qualified name
+    of every class-based subcommand below it (such as ``'tag alias add'``) to its class,
+    and a ``get_route(qualified_name)`` method to look one up. The routes are kept up to date
+    as commands are added to or removed from class-based groups, and carry over to the copies
+    made when a group is bound to a cog. Interactions are still dispatched by the
+    :class:`~discord.app_commands.CommandTree` as usual, the routes do not take part in that.
+
+    Subcommands can share options by inheriting from a plain class that declares them
+    with :class:`Option`. Other attributes of such a class are not turned into options.
+
+    .. versionadded:: 1.2
+
+    Parameters
+    -----------
+    name: :class:`str`
+        The name of the group. If not given, it defaults to a lower-case
+        version of the class name.
+    description: :class:`str`
+        The description of the group. This shows up in the UI to describe
+        the group. If not given, it defaults to the docstring of the
+        class shortened to 100 characters.
+    guild: :class:`~discord.abc.Snowflake`
+        The guild to restrict the group to.
+    guilds: List[:class:`~discord.abc.Snowflake`]
+        A list of guilds to restrict the group to.
+        Cannot be used with ``guild``.
+    default_permissions: Optional[:class:`~discord.Permissions`]
+        The default permissions that can execute this group on Discord. Note
+        that server administrators can override this value in the client.
+        Setting an empty permissions field will disallow anyone except server
+        administrators from using the command in a guild.
+
+        Due to a Discord limitation, this does not work on nested groups.
+    guild_only: :class:`bool`
+        Whether the group should only be usable in guild contexts.
+        Defaults to ``False``.
+
+        Due to a Discord limitation, this does not work on nested groups.
+    parent: :class:`~discord.app_commands.Group`
+        The group's parent. Groups nested in another class do not need this.
+    nsfw: :class:`bool`
+        Whether the group is NSFW and should only work in NSFW channels. Defaults to ``False``.
+
+        Due to a Discord limitation, this does not work on nested groups.
+    """
+
+    pass
@@ -0,0 +1,239 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import math
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Type, TypeVar
+
+if TYPE_CHECKING:
+    from .commands import Command
+
+    Sink = Callable[[Type[Command], str, float], Any]
+
+# fmt: off
+__all__ = (
+    'Histogram',
+    'enable_instrumentation',
+    'disable_instrumentation',
+    'stats',
+    'reset_stats',
+)
+# fmt: on
+
+T = TypeVar('T')
+
+# Bucket i holds durations in [2 ** (i - 1), 2 ** i) microseconds, the last one catches everything above ~2 minutes
+_BUCKETS = 28
+
+
+class Histogram:
+    """Represents a latency histogram for a single phase of a command.
+
+    Durations are sorted into power-of-two buckets of microseconds, so
+    recording is constant time and percentiles are approximate.
+
+    .. versionadded:: 1.2
+
+    Attributes
+    -----------
+    count: :class:`int`
+        The amount of recorded durations.
+    total: :class:`float`
+        The sum of all recorded durations, in seconds.
+    min: :class:`float`
+        The shortest recorded duration, in seconds.
+    max: :class:`float`
+        The longest recorded duration, in seconds.
+    """
+
+    __slots__ = ('count', 'total', 'min', 'max', '_buckets')
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.min: float = math.inf
+        self.max: float = 0.0
+        self._buckets: List[int] = [0] * _BUCKETS
+
+    def __repr__(self) -> str:
+        return f'<Histogram count={self.count} mean={self.mean:.6f} p99={self.percentile(99):.6f}>'
+
+    @property
+    def mean(self) -> float:
+        """:class:`float`: The mean recorded duration, in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def record(self, duration: float) -> None:
+        """Records a duration.
+
+        Parameters
+        -----------
+        duration: :class:`float`
+            The duration to record, in seconds.
+        """
+        self.count += 1
+        self.total += duration
+        if duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+        self._buckets[min(math.frexp(duration * 1e6)[1], _BUCKETS - 1) if duration >= 1e-6 else 0] += 1
+
+    def percentile(self, percent: float) -> float:
+        """Returns an approximation of the given percentile.
+
+        Parameters
+        -----------
+        percent: :class:`float`
+            The percentile to compute, between 0 and 100.
+
+        Returns
+        --------
+        :class:`float`
+            The upper bound of the bucket the percentile falls in, in seconds,
+            clamped to the longest recorded duration.
+        """
+        if not self.count:
+            return 0.0
+
+        target = self.count * percent / 100
+        seen = 0
+        for index, amount in enumerate(self._buckets):
+            seen += amount
+            if seen >= target:
+                return min(2**index / 1e6, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON serialisable summary of the histogram.
+
+        Returns
+        --------
+        Dict[:class:`str`, Any]
+            The count, total, mean, min, max, p50, p95 and p99 of the histogram.
+        """
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.mean,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+
+class _Instrumentation:
+    __slots__ = ('enabled', 'sink', 'histograms')
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.sink: Optional[Sink] = None
+        self.histograms: Dict[Type[Command], Dict[str, Histogram]] = {}
+
+    def record(self, cls: Type[Command], phase: str, duration: float) -> None:
+        try:
+            phases = self.histograms[cls]
+        except KeyError:
+            phases = self.histograms[cls] = {}
+        try:
+            histogram = phases[phase]
+        except KeyError:
+            histogram = phases[phase] = Histogram()
+        histogram.record(duration)
+
+        if self.sink is not None:
+            self.sink(cls, phase, duration)
+
+    def measure(self, cls: Type[Command], phase: str, coro: Awaitable[T]) -> Awaitable[T]:
+        # The awaitable is passed through untouched when disabled, so the only cost is this call
+        if not self.enabled:
+            return coro
+        return self._measure(cls, phase, coro)
+
+    async def _measure(self, cls: Type[Command], phase: str, coro: Awaitable[T]) -> T:
+        start = perf_counter()
+        try:
+            return await coro
+        finally:
+            self.record(cls, phase, perf_counter() - start)
+
+
+_instrumentation = _Instrumentation()
+
+
+def enable_instrumentation(*, sink: Optional[Sink] = None) -> None:
+    """Enables recording of per-phase latencies for all class-based commands.
+
+    The recorded phases are ``construct``, ``check``, ``transform``, ``callback``,
+    ``autocomplete``, ``defer``, ``send``, ``original_message`` and ``on_error``.
+    Phases are timed using :func:`time.perf_counter`.
+
+    When disabled (the default), instrumentation costs a single attribute check per phase.
+
+    .. versionadded:: 1.2
+
+    Parameters
+    -----------
+    sink: Optional[Callable[[Type[:class:`Command`], :class:`str`, :class:`float`], Any]]
+        A callable that is additionally called with the command class, the phase
+        and the duration in seconds for every recording. It must not block.
+    """
+    _instrumentation.sink = sink
+    _instrumentation.enabled = True
+
+
+def disable_instrumentation() -> None:
+    """Disables the recording of latencies. Already recorded statistics are kept.
+
+    .. versionadded:: 1.2
+    """
+    _instrumentation.enabled = False
+    _instrumentation.sink = None
+
+
+def stats() -> Dict[Type[Command], Dict[str, Histogram]]:
+    """Returns the recorded latencies of all class-based commands.
+
+    The statistics of a single command can be retrieved with ``command.cls.stats()``.
+
+    .. versionadded:: 1.2
+
+    Returns
+    --------
+    Dict[Type[:class:`Command`], Dict[:class:`str`, :class:`Histogram`]]
+        A mapping of command classes to a mapping of phase names to their histogram.
+    """
+    return {cls: phases.copy() for cls, phases in _instrumentation.histograms.items()}
+
+
+def reset_stats() -> None:
+    """Clears all recorded latencies.
+
+    .. versionadded:: 1.2
+    """
+    _instrumentation.histograms.clear()
@@ -24,36 +24,167 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
-import sys
-from typing import TYPE_CHECKING, Any, List, Type, TypeVar, Union
+import asyncio
+import inspect
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Dict, List, Type, TypeVar, Union
 
-from discord import AppCommandType, Member, Message, User
+from discord import AppCommandType, HTTPException, InteractionResponded, Member, Message, User
 from discord.app_commands.commands import (
+    Command,
     ContextMenu,
     _parse_args_from_docstring,
     _populate_autocomplete,
     _populate_choices,
     _populate_descriptions,
     _populate_renames,
-    annotation_to_parameter,
 )
-from discord.utils import MISSING, resolve_annotation, maybe_coroutine
+from discord.utils import MISSING, maybe_coroutine, utcnow
+
+from .autocomplete import AutocompleteCache
+from .instrumentation import _instrumentation
+from .paramcache import _annotation_cache, _parameter_cache
 
 if TYPE_CHECKING:
     from discord import Interaction
-    from discord.app_commands.commands import AppCommandError, Choice, Command, CommandParameter
+    from discord.app_commands.commands import AppCommandError, Choice, CommandParameter
+    from discord.app_commands.namespace import Namespace
 
     from .commands import Command as _Command
+    from .pool import InstancePool
+    from .search import ChoiceIndex
 
     AppCommand = Union[Command, ContextMenu]
 
 CB = TypeVar('CB')
 
+_INSTANCE_KEY = '__discord_class_commands_instance__'
+_DEFER_KEY = '__discord_class_commands_defer__'
+
+
+class _ClassCommand(Command):
+    # The slash command that class-based commands turn into, so phases that discord.py runs can be measured
+    # and lazy commands can resolve their parameters the first time discord.py looks at them
+    cls: Type[_Command]
+    _unresolved: bool = False
+
+    @property
+    def _params(self) -> Dict[str, CommandParameter]:
+        if self._unresolved:
+            # Cleared first, as resolving reads the parameters it just set
+            self._unresolved = False
+            try:
+                _inject_resolved_parameters(self.cls, self)
+            except BaseException:
+                self._unresolved = True
+                raise
+        return self.__dict__['_params']
+
+    @_params.setter
+    def _params(self, value: Dict[str, CommandParameter]) -> None:
+        self.__dict__['_params'] = value
+
+    def _transform_arguments(self, interaction: Interaction, namespace: Namespace) -> Any:
+        coro = super()._transform_arguments(interaction, namespace)
+        return _instrumentation.measure(self.cls, 'transform', coro)
+
+    def _copy_with(self, **kwargs: Any) -> Any:
+        copy = super()._copy_with(**kwargs)
+        copy.cls = self.cls
+        return copy
+
+
+def _get_instance(cls: Type[_Command], interaction: Interaction) -> Any:
+    # The same instance is shared between the check, callback, autocomplete and error handler
+    # of an interaction, so it is stored alongside the interaction itself
+    extras = interaction.extras
+    try:
+        return extras[_INSTANCE_KEY]
+    except KeyError:
+        pool = cls.__discord_app_commands_pool__
+        if _instrumentation.enabled:
+            start = perf_counter()
+            inst = cls() if pool is None else pool.acquire()
+            _instrumentation.record(cls, 'construct', perf_counter() - start)
+        else:
+            inst = cls() if pool is None else pool.acquire()
+        extras[_INSTANCE_KEY] = inst
+        inst.interaction = interaction
+        return inst
+
+
+def _release_instance(pool: InstancePool, interaction: Interaction, inst: Any) -> None:
+    # Only called once the instance is guaranteed not to be needed by the interaction anymore
+    if interaction.extras.pop(_INSTANCE_KEY, None) is inst:
+        pool.release(inst)
+
+
+def _start_auto_defer(cls: Type[_Command], interaction: Interaction) -> None:
+    # The timer handle is swapped for the defer task once it fires, so send() knows what to wait for
+    extras = interaction.extras
+    ephemeral = cls.__discord_app_commands_auto_defer_ephemeral__
+
+    async def defer() -> None:
+        try:
+            await _instrumentation.measure(cls, 'defer', interaction.response.defer(ephemeral=ephemeral))
+        except (InteractionResponded, HTTPException):
+            # Responded to in the meantime, or the interaction is already gone; send() copes with both
+            pass
+
+    def fire() -> None:
+        if interaction.response.is_done():
+            extras.pop(_DEFER_KEY, None)
+        else:
+            extras[_DEFER_KEY] = asyncio.create_task(defer())
+
+    # Checks and transformers have already run by now, so the delay counts from when Discord created the interaction.
+    # A local clock running behind is clamped, so the defer never comes later than configured.
+    elapsed = max((utcnow() - interaction.created_at).total_seconds(), 0.0)
+    delay = max(cls.__discord_app_commands_auto_defer__ - elapsed, 0.0)  # type: ignore # Only called when set
+    extras[_DEFER_KEY] = asyncio.get_running_loop().call_later(delay, fire)
+
+
+def _stop_auto_defer(interaction: Interaction) -> None:
+    # A defer that is already in flight is left to finish, cancelling it could leave the interaction half-acknowledged
+    pending = interaction.extras.pop(_DEFER_KEY, None)
+    if isinstance(pending, asyncio.TimerHandle):
+        pending.cancel()
+
+
+async def _settle_auto_defer(interaction: Interaction) -> bool:
+    # Called before responding, so a response never races the automatic defer.
+    # Returns whether the automatic defer went out, in which case the interaction is already acknowledged.
+    pending = interaction.extras.pop(_DEFER_KEY, None)
+    if pending is None:
+        return False
+    if isinstance(pending, asyncio.TimerHandle):
+        pending.cancel()
+        return False
+    await pending
+    return interaction.response.is_done()
+
+
+def _compile_function(source: str, name: str, qualname: str, globalns: Dict[str, Any]) -> Any:
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f'<class_commands {qualname}>', 'exec'), globalns, namespace)
+    func = namespace[name]
+    func.__qualname__ = qualname
+    return func
+
+
+def _generate_init(cls: Type[_Command]) -> Any:
+    # Slots have no class-level default, so the initializer fills in what the class attributes otherwise would
+    names = [parameter.name for parameter in cls.__discord_app_commands_params__]
+    body = '\n'.join(f'    self.{name} = None' for name in names) or '    pass'
+    return _compile_function(f'def __init__(self):\n{body}\n', '__init__', f'{cls.__qualname__}.__init__', {})
+
 
 # This is all next-level cursed
 def _generate_callback(cls: Type[_Command], fake: bool = False) -> Any:
     # Context menu callback relies on the annotation, so this duplication is necessary
     # The callback reassignation is so pyright doesn't complain that I'm redefining functions
+    pool = cls.__discord_app_commands_pool__
+    auto_defer = cls.__discord_app_commands_auto_defer__
     if fake:
 
         async def fake_callback(interaction: Interaction):
@@ -63,32 +194,78 @@ def _generate_callback(cls: Type[_Command], fake: bool = False) -> Any:
     elif cls.__discord_app_commands_type__ is AppCommandType.user:
 
         async def user_callback(interaction: Interaction, target: Union[Member, User]):
-            inst = cls()
-            inst.interaction = interaction
+            inst = _get_instance(cls, interaction)
             inst.target = target  # type: ignore # Runtime attribute assignment
-            await inst.callback()
+            if auto_defer is None:
+                await _instrumentation.measure(cls, 'callback', inst.callback())
+            else:
+                _start_auto_defer(cls, interaction)
+                try:
+                    await _instrumentation.measure(cls, 'callback', inst.callback())
+                finally:
+                    _stop_auto_defer(interaction)
+            if pool is not None:
+                _release_instance(pool, interaction, inst)
 
         callback = user_callback
     elif cls.__discord_app_commands_type__ is AppCommandType.message:
 
         async def message_callback(interaction: Interaction, target: Message):
-            inst = cls()
-            inst.interaction = interaction
+            inst = _get_instance(cls, interaction)
             inst.target = target  # type: ignore # Runtime attribute assignment
-            await inst.callback()
+            if auto_defer is None:
+                await _instrumentation.measure(cls, 'callback', inst.callback())
+            else:
+                _start_auto_defer(cls, interaction)
+                try:
+                    await _instrumentation.measure(cls, 'callback', inst.callback())
+                finally:
+                    _stop_auto_defer(interaction)
+            if pool is not None:
+                _release_instance(pool, interaction, inst)
 
         callback = message_callback
     else:
+        callback = _generate_slash_callback(cls)
 
-        async def slash_callback(interaction: Interaction, **params) -> None:
-            inst = cls()
-            inst.interaction = interaction
-            inst.__dict__.update(params)
-            await inst.callback()
+    return callback
 
-        callback = slash_callback
 
-    return callback
+def _generate_slash_callback(cls: Type[_Command]) -> Any:
+    # discord.py passes the transformed values as keyword arguments, so an explicit signature
+    # binds them straight to locals and each one can be assigned without going through a dict.
+    # Option names can never start with an underscore, so the globals used here cannot clash.
+    names = [parameter.name for parameter in cls.__discord_app_commands_params__]
+    signature = ''.join(f', {name}' for name in names)
+    body = ''.join(f'    _inst.{name} = {name}\n' for name in names)
+    release = '    _release_instance(_pool, interaction, _inst)\n' if cls.__discord_app_commands_pool__ is not None else ''
+    if cls.__discord_app_commands_auto_defer__ is None:
+        invoke = '    await _measure(_cls, "callback", _inst.callback())\n'
+    else:
+        invoke = (
+            '    _start_auto_defer(_cls, interaction)\n'
+            '    try:\n'
+            '        await _measure(_cls, "callback", _inst.callback())\n'
+            '    finally:\n'
+            '        _stop_auto_defer(interaction)\n'
+        )
+    source = (
+        f'async def slash_callback(interaction{signature}):\n'
+        f'    _inst = _get_instance(_cls, interaction)\n'
+        f'{body}'
+        f'{invoke}'
+        f'{release}'
+    )
+    globalns = {
+        '_cls': cls,
+        '_pool': cls.__discord_app_commands_pool__,
+        '_get_instance': _get_instance,
+        '_release_instance': _release_instance,
+        '_start_auto_defer': _start_auto_defer,
+        '_stop_auto_defer': _stop_auto_defer,
+        '_measure': _instrumentation.measure,
+    }
+    return _compile_function(source, 'slash_callback', '_generate_callback.<locals>.slash_callback', globalns)
 
 
 def _inject_callback(cls: Type[_Command], command: AppCommand) -> None:
@@ -99,19 +276,27 @@ def _inject_callback(cls: Type[_Command], command: AppCommand) -> None:
 
 
 def _inject_error_handler(cls: Type[_Command], command: AppCommand) -> None:
+    pool = cls.__discord_app_commands_pool__
+
     async def on_error(interaction: Interaction, error: AppCommandError) -> None:
-        inst = cls()
-        inst.interaction = interaction
-        return await maybe_coroutine(inst.on_error, error)
+        inst = _get_instance(cls, interaction)
+        await _instrumentation.measure(cls, 'on_error', maybe_coroutine(inst.on_error, error))
+        if pool is not None:
+            _release_instance(pool, interaction, inst)
 
     command.on_error = on_error
 
 
 def _inject_check(cls: Type[_Command], command: AppCommand) -> None:
+    from .commands import Command
+
+    if cls.check is Command.check:
+        # Nothing to check, so skip the extra predicate on every invocation
+        return
+
     async def check(interaction: Interaction) -> bool:
-        inst = cls()
-        inst.interaction = interaction
-        return await maybe_coroutine(inst.check)
+        inst = _get_instance(cls, interaction)
+        return await _instrumentation.measure(cls, 'check', maybe_coroutine(inst.check))
 
     command.checks.append(check)
 
@@ -121,19 +306,63 @@ def _inject_parameters(cls: Type[_Command], command: AppCommand) -> None:
     if isinstance(command, ContextMenu):
         return
 
+    if not getattr(cls, '__discord_app_commands_slotted__', False):
+        for parameter in cls.__discord_app_commands_params__:
+            setattr(cls, parameter.name, None)  # Default all attributes to None for autocomplete purposes
+
+    try:
+        command.default_permissions = cls.__discord_app_commands_default_permissions__
+    except AttributeError:
+        pass
+
+    try:
+        command.guild_only = cls.__discord_app_commands_guild_only__
+    except AttributeError:
+        pass
+
+
+def _inject_resolved_parameters(cls: Type[_Command], command: AppCommand) -> None:
+    # The expensive part of turning a class into a command, which lazy commands put off until it is needed
+    if isinstance(command, ContextMenu):
+        return
+
+    key = _parameter_cache.key(cls) if _parameter_cache.directory is not None else None
+    result = _parameter_cache.load(key) if key is not None else None
+    if result is None:
+        result = _resolve_parameters(cls)
+        if key is not None:
+            _parameter_cache.store(key, result, cls.__module__)
+
+    try:
+        autocomplete = cls.__discord_app_commands_param_autocomplete__
+    except AttributeError:
+        pass
+    else:
+        _populate_autocomplete(result, autocomplete.copy())
+
+    command._params = result
+    _inject_autocomplete(cls, command)
+    _inject_sources(cls, command)
+
+
+def _resolve_parameters(cls: Type[_Command]) -> Dict[str, CommandParameter]:
+    # Everything in here only depends on the class definition, so the result can be cached
     params = cls.__discord_app_commands_params__
     cache = {}
-    globalns = vars(sys.modules[cls.__module__])  # I don't want to talk about it
+    module = cls.__module__
+    # Options inherited from mixins are resolved in the module of the mixin
+    modules = getattr(cls, '__discord_app_commands_param_modules__', {})
 
     parameters: List[CommandParameter] = []
     for parameter in params:
         if parameter.annotation is parameter.empty:
             raise TypeError(f'Annotation for {parameter.name} must be given in comm {cls.__qualname__!r}')
 
-        resolved = resolve_annotation(parameter.annotation, globalns, globalns, cache)
-        param = annotation_to_parameter(resolved, parameter)
-        parameters.append(param)
-        setattr(cls, parameter.name, None)  # Default all attributes to None for autocomplete purposes
+        if parameter.name in modules:
+            # The evaluation cache is per namespace, so these get their own
+            parameters.append(_annotation_cache.parameter(modules[parameter.name], parameter, {}))
+        else:
+            parameters.append(_annotation_cache.parameter(module, parameter, cache))
 
     values = sorted(parameters, key=lambda a: a.required, reverse=True)
     result = {v.name: v for v in values}
@@ -163,52 +392,136 @@ def _inject_parameters(cls: Type[_Command], command: AppCommand) -> None:
     else:
         _populate_choices(result, choices.copy())
 
-    try:
-        autocomplete = cls.__discord_app_commands_param_autocomplete__
-    except AttributeError:
-        pass
-    else:
-        _populate_autocomplete(result, autocomplete.copy())
+    return result
 
-    try:
-        command.default_permissions = cls.__discord_app_commands_default_permissions__
-    except AttributeError:
-        pass
+
+def _inject_autocomplete(cls: Type[_Command], command: AppCommand) -> None:
+    if isinstance(command, ContextMenu):
+        return
 
     try:
-        command.guild_only = cls.__discord_app_commands_guild_only__
+        autocompleted = cls.__discord_app_commands_param_autocompleted__
     except AttributeError:
-        pass
-
-    command._params = result
-
+        return
 
-def _inject_autocomplete(cls: Type[_Command], command: AppCommand) -> None:
+    # The namespace is keyed by the names Discord knows the options by
+    renames = {str(param.display_name): name for name, param in command._params.items()}
+    pool = cls.__discord_app_commands_pool__
+
+    cache = getattr(cls.autocomplete, 'cache', None)
+    if not isinstance(cache, AutocompleteCache):
+        cache = None
+
+    generator = inspect.isasyncgenfunction(cls.autocomplete)  # type: ignore # Only slash commands can have autocomplete
+    timeout = cls.__discord_app_commands_autocomplete_timeout__
+    cancel_stale = cls.__discord_app_commands_autocomplete_cancel_stale__
+
+    # Every option gets its own handler, so the focused option is known without inspecting the values
+    def make_autocomplete(focused: str) -> Any:
+        inflight: Dict[int, asyncio.Task[List[Choice]]] = {}
+        last: Dict[int, List[Choice]] = {}
+
+        async def run(inst: Any, partial: List[List[Choice]]) -> List[Choice]:
+            if not generator:
+                return await inst.autocomplete(focused)
+
+            async for choices in inst.autocomplete(focused):
+                partial.append(choices)
+            return partial[-1] if partial else []
+
+        async def autocomplete(interaction: Interaction, current: Any) -> List[Choice]:
+            if cache is not None:
+                options = {k: v for k, v in interaction.namespace.__dict__.items() if renames.get(k) != focused}
+                key = cache._key(cls, interaction, focused, current, options)
+                choices = cache._get(key)
+                if choices is not None:
+                    return choices
+
+            inst = _get_instance(cls, interaction)
+            try:
+                for k, v in interaction.namespace.__dict__.items():
+                    try:
+                        setattr(inst, renames[k], v)
+                    except KeyError:
+                        pass
+
+                partial: List[List[Choice]] = []
+                coro = _instrumentation.measure(cls, 'autocomplete', run(inst, partial))
+                if not cancel_stale and timeout is None:
+                    choices = await coro
+                else:
+                    # The handler gets its own task, so cancelling it leaves the rest of the dispatch alone
+                    user_id = interaction.user.id
+                    task = asyncio.ensure_future(coro)
+                    if cancel_stale:
+                        # Superseded interactions are left unanswered, as Discord discards their response anyway
+                        previous = inflight.get(user_id)
+                        if previous is not None:
+                            previous.cancel()
+                        inflight[user_id] = task
+
+                    try:
+                        if timeout is None:
+                            choices = await task
+                        else:
+                            try:
+                                choices = await asyncio.wait_for(task, timeout)
+                            except asyncio.TimeoutError:
+                                # Out of time, so fall back to whatever is available before Discord gives up on us
+                                return partial[-1] if partial else last.get(user_id, [])
+
+                            last.pop(user_id, None)
+                            last[user_id] = choices
+                            if len(last) > 1024:
+                                del last[next(iter(last))]
+                    finally:
+                        if inflight.get(user_id) is task:
+                            del inflight[user_id]
+            finally:
+                if pool is not None:
+                    _release_instance(pool, interaction, inst)
+
+            if cache is not None:
+                cache._set(key, choices)  # type: ignore # key is bound whenever cache is
+            return choices
+
+        return autocomplete
+
+    _populate_autocomplete(command._params, {k: make_autocomplete(k) for k in autocompleted})
+
+
+def _inject_sources(cls: Type[_Command], command: AppCommand) -> None:
     if isinstance(command, ContextMenu):
         return
 
     try:
-        autocompleted = cls.__discord_app_commands_param_autocompleted__
+        sources = cls.__discord_app_commands_param_sources__
     except AttributeError:
         return
 
-    async def autocomplete(interaction: Interaction, current: Any) -> List[Choice]:
-        inst = cls()
-        inst.interaction = interaction
-        inst.__dict__.update(interaction.namespace.__dict__)
+    # Options with a source are answered straight from their index, no instance required
+    def make_autocomplete(index: ChoiceIndex) -> Any:
+        async def autocomplete(interaction: Interaction, current: Any) -> List[Choice]:
+            return index.search(str(current))
+
+        return autocomplete
+
+    _populate_autocomplete(command._params, {k: make_autocomplete(index) for k, index in sources.items()})
 
-        for k, v in inst.__dict__.items():
-            if v == current:
-                return await inst.autocomplete(k)  # type: ignore # Only slash commands can have autocomplete
-        return []
 
-    _populate_autocomplete(command._params, {k: autocomplete for k in autocompleted})
+def _inject_initializer(cls: Type[_Command]) -> None:
+    if getattr(cls, '__discord_app_commands_slotted__', False):
+        cls.__init__ = _generate_init(cls)
 
 
 def _inject_class_based_information(cls: Union[Type[_Command], Any], command: AppCommand) -> None:
+    _inject_initializer(cls)
     _inject_callback(cls, command)
     _inject_parameters(cls, command)
-    _inject_autocomplete(cls, command)
     _inject_error_handler(cls, command)
     _inject_check(cls, command)
     command.cls = cls  # type: ignore # Runtime attribute assignment
+    if cls.__discord_app_commands_lazy__ and isinstance(command, _ClassCommand):
+        command._unresolved = True
+    else:
+        _inject_resolved_parameters(cls, command)
@@ -0,0 +1,142 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+from typing import TYPE_CHECKING, Any, Optional
+
+from discord import InteractionMessage
+
+if TYPE_CHECKING:
+    from discord import Interaction
+
+# fmt: off
+__all__ = (
+    'LazyMessage',
+)
+# fmt: on
+
+
+class LazyMessage:
+    """Represents the original response to an interaction, fetched only when needed.
+
+    This is returned by :meth:`Command.send` when it responds to the interaction with
+    ``fetch=False``, saving the request needed to retrieve the message when it is not used.
+
+    :meth:`edit` and :meth:`delete` work without fetching the message. The other coroutine
+    methods of :class:`~discord.InteractionMessage`, such as :meth:`~discord.Message.add_reaction`,
+    retrieve the message first if needed. Every other attribute is available once the message
+    has been retrieved with :meth:`fetch`.
+
+    .. versionadded:: 1.2
+
+    Attributes
+    -----------
+    interaction: :class:`~discord.Interaction`
+        The interaction the message responds to.
+    """
+
+    __slots__ = ('interaction', '_message')
+
+    def __init__(self, interaction: Interaction) -> None:
+        self.interaction: Interaction = interaction
+        self._message: Optional[InteractionMessage] = None
+
+    def __repr__(self) -> str:
+        return f'<LazyMessage interaction={self.interaction!r} message={self._message!r}>'
+
+    def __getattr__(self, name: str) -> Any:
+        message = self._message
+        if message is not None:
+            return getattr(message, name)
+
+        # Methods can wait for the message to be retrieved, plain attributes cannot
+        method = getattr(InteractionMessage, name, None)
+        if method is None or not inspect.iscoroutinefunction(method):
+            raise AttributeError(f'{name!r} is not available before the message is retrieved with fetch()')
+
+        @functools.wraps(method)
+        async def fetch_and_call(*args: Any, **kwargs: Any) -> Any:
+            message = await self.fetch()
+            return await getattr(message, name)(*args, **kwargs)
+
+        return fetch_and_call
+
+    @property
+    def fetched(self) -> bool:
+        """:class:`bool`: Whether the message has been retrieved."""
+        return self._message is not None
+
+    async def fetch(self) -> InteractionMessage:
+        """|coro|
+
+        Retrieves the message. Subsequent calls return the same message without a request.
+
+        Raises
+        -------
+        ~discord.HTTPException
+            Fetching the message failed.
+
+        Returns
+        --------
+        :class:`~discord.InteractionMessage`
+            The message.
+        """
+        if self._message is None:
+            self._message = await self.interaction.original_message()
+        return self._message  # type: ignore # Set above
+
+    async def edit(self, **kwargs: Any) -> InteractionMessage:
+        """|coro|
+
+        Edits the message without retrieving it first.
+
+        This takes the same parameters as :meth:`discord.Interaction.edit_original_message`.
+
+        Raises
+        -------
+        ~discord.HTTPException
+            Editing the message failed.
+
+        Returns
+        --------
+        :class:`~discord.InteractionMessage`
+            The edited message.
+        """
+        self._message = message = await self.interaction.edit_original_message(**kwargs)
+        return message
+
+    async def delete(self) -> None:
+        """|coro|
+
+        Deletes the message without retrieving it first.
+
+        Raises
+        -------
+        ~discord.HTTPException
+            Deleting the message failed.
+        """
+        await self.interaction.delete_original_message()
@@ -25,10 +25,12 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import inspect
-from typing import TYPE_CHECKING, Any, List
+from typing import TYPE_CHECKING, Any, Iterable, List, Union
 
 from discord.utils import MISSING
 
+from .search import ChoiceIndex
+
 if TYPE_CHECKING:
     from discord.app_commands.commands import Choice, ChoiceT
 
@@ -52,7 +54,7 @@ class ParameterData(inspect.Parameter):  # This is a fake inspect.Parameter desi
 
 
 class _Option:
-    __slots__ = ('autocomplete', 'default', 'description', 'name', 'choices')
+    __slots__ = ('autocomplete', 'default', 'description', 'name', 'choices', 'source')
 
     def __init__(
         self,
@@ -62,12 +64,14 @@ class _Option:
         *,
         autocomplete: bool = False,
         choices: List[Choice[ChoiceT]] = MISSING,
+        source: Union[ChoiceIndex, Iterable[Union[str, Choice[ChoiceT]]]] = MISSING,
     ) -> None:
         self.description = description
         self.default = default
         self.autocomplete = autocomplete
         self.name = name
         self.choices = choices
+        self.source = source if source is MISSING or isinstance(source, ChoiceIndex) else ChoiceIndex(source)
 
 
 if TYPE_CHECKING:
@@ -79,6 +83,7 @@ if TYPE_CHECKING:
         *,
         autocomplete: bool = MISSING,
         choices: List[Choice[ChoiceT]] = MISSING,
+        source: Union[ChoiceIndex, Iterable[Union[str, Choice[ChoiceT]]]] = MISSING,
     ) -> Any:
         ...
 
@@ -108,6 +113,13 @@ else:
                 This is not the only way to provide choices to a command.
                 There are two more ergonomic ways of doing this, using a
                 :obj:`typing.Literal` annotation or a :class:`enum.Enum`.
+        source: Union[:class:`ChoiceIndex`, Iterable[Union[:class:`str`, :class:`~discord.app_commands.Choice`]]]
+            A large set of choices to autocomplete the option from. Unlike ``choices``, this is
+            not limited to 25 entries. An iterable is indexed into a :class:`ChoiceIndex` once, and
+            autocomplete interactions for the option are answered from it without calling
+            :meth:`SlashCommand.autocomplete`.
+
+            .. versionadded:: 1.2
         """
 
         pass
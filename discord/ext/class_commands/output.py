@@ -0,0 +1,219 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from discord import AllowedMentions, Embed, Message
+
+    from .commands import Command
+    from .message import LazyMessage
+
+# fmt: off
+__all__ = (
+    'OutputBuffer',
+)
+# fmt: on
+
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+MAX_EMBEDS_LENGTH = 6000
+
+
+def _split_content(content: str) -> Tuple[List[str], str]:
+    # Splits off as many full messages as needed, preferably on line boundaries, and returns the rest
+    pages = []
+    while len(content) > MAX_CONTENT_LENGTH:
+        index = content.rfind('\n', 0, MAX_CONTENT_LENGTH + 1)
+        if index > 0:
+            # The newline the message is split on would only add a blank line
+            pages.append(content[:index])
+            content = content[index + 1 :]
+        else:
+            pages.append(content[:MAX_CONTENT_LENGTH])
+            content = content[MAX_CONTENT_LENGTH:]
+    return pages, content
+
+
+class OutputBuffer:
+    """Represents a buffered writer that merges output into as few messages as possible.
+
+    This is returned by :meth:`Command.output` and is meant to be used as an asynchronous
+    context manager. Writes are merged into messages within Discord's content and embed limits,
+    which are sent through :meth:`Command.send` in order as soon as they are full. Whatever is
+    left is sent when the context manager exits or :meth:`flush` is called.
+
+    Content longer than a single message is split on line boundaries where possible.
+    Content written after an embed starts a new message, so the output keeps its order.
+
+    .. versionadded:: 1.2
+
+    Attributes
+    -----------
+    command: :class:`Command`
+        The command the output is sent for.
+    ephemeral: :class:`bool`
+        Whether the messages are ephemeral.
+    allowed_mentions: Optional[:class:`~discord.AllowedMentions`]
+        The mentions allowed in the messages.
+    messages: List[Union[:class:`~discord.Message`, :class:`LazyMessage`]]
+        The messages sent so far.
+    """
+
+    __slots__ = (
+        'command',
+        'ephemeral',
+        'allowed_mentions',
+        'messages',
+        '_content',
+        '_embeds',
+        '_embeds_length',
+        '_queue',
+        '_task',
+        '_error',
+    )
+
+    def __init__(
+        self, command: Command, *, ephemeral: bool = False, allowed_mentions: Optional[AllowedMentions] = None
+    ) -> None:
+        self.command: Command = command
+        self.ephemeral: bool = ephemeral
+        self.allowed_mentions: Optional[AllowedMentions] = allowed_mentions
+        self.messages: List[Union[Message, LazyMessage]] = []
+        self._content: str = ''
+        self._embeds: List[Embed] = []
+        self._embeds_length: int = 0
+        self._queue: Deque[Tuple[str, List[Embed]]] = deque()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._error: Optional[BaseException] = None
+
+    def __repr__(self) -> str:
+        return f'<OutputBuffer command={self.command!r} pending={len(self._queue)} sent={len(self.messages)}>'
+
+    async def __aenter__(self) -> OutputBuffer:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.flush()
+
+    def write(self, content: Any) -> None:
+        """Writes content to the buffer.
+
+        Like :meth:`io.TextIOBase.write`, no separator is added between writes.
+
+        Parameters
+        -----------
+        content: :class:`str`
+            The content to write. This is converted to a string.
+        """
+        content = str(content)
+        if not content:
+            return
+        if self._embeds:
+            self._close()
+
+        pages, self._content = _split_content(self._content + content)
+        self._queue.extend((page, []) for page in pages)
+        self._schedule()
+
+    def embed(self, embed: Embed) -> None:
+        """Adds an embed to the buffer.
+
+        Parameters
+        -----------
+        embed: :class:`~discord.Embed`
+            The embed to add.
+        """
+        length = len(embed)
+        if len(self._embeds) >= MAX_EMBEDS or (self._embeds and self._embeds_length + length > MAX_EMBEDS_LENGTH):
+            self._close()
+
+        self._embeds.append(embed)
+        self._embeds_length += length
+
+    async def flush(self) -> None:
+        """|coro|
+
+        Sends everything that has been buffered, including an incomplete message,
+        and waits until all of it has been sent.
+
+        Raises
+        -------
+        ~discord.HTTPException
+            Sending a message failed. The messages after it are kept in the buffer.
+        """
+        self._close()
+        self._schedule()
+        while self._task is not None:
+            await self._task
+
+        error = self._error
+        if error is not None:
+            # The next flush retries whatever was left
+            self._error = None
+            raise error
+
+    def _close(self) -> None:
+        # Queues the message being built, so nothing else is merged into it
+        if self._content or self._embeds:
+            self._queue.append((self._content, self._embeds))
+            self._content = ''
+            self._embeds = []
+            self._embeds_length = 0
+            self._schedule()
+
+    def _schedule(self) -> None:
+        # Messages are sent one at a time by a single task, which keeps them in order
+        if self._queue and self._task is None and self._error is None:
+            self._task = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        queue = self._queue
+        try:
+            while queue:
+                content, embeds = queue[0]
+                message = await self.command.send(
+                    content or None,
+                    embeds=embeds or None,
+                    allowed_mentions=self.allowed_mentions,
+                    ephemeral=self.ephemeral,
+                    fetch=False,
+                )
+                queue.popleft()
+                self.messages.append(message)
+        except Exception as exc:
+            self._error = exc
+        finally:
+            self._task = None
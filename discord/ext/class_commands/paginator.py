@@ -0,0 +1,222 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from discord import ButtonStyle, ui
+from discord.utils import MISSING
+
+from .output import MAX_CONTENT_LENGTH
+
+if TYPE_CHECKING:
+    from discord import Interaction, Message
+
+    from .message import LazyMessage
+
+# fmt: off
+__all__ = (
+    'Paginator',
+)
+# fmt: on
+
+T = TypeVar('T')
+
+
+async def _aiter(iterable: Iterable[T]) -> AsyncIterator[T]:
+    for item in iterable:
+        yield item
+
+
+class Paginator(ui.View, Generic[T]):
+    """Represents a view that pages through rows pulled lazily from a source.
+
+    This is returned by :meth:`Command.paginate`. Rows are only pulled from the
+    source when a page is rendered, so memory use depends on the page size instead
+    of the amount of rows. Pages that were already shown are kept as rendered text,
+    so going back does not require the source to be restartable.
+
+    Only the user who invoked the command can use the buttons.
+
+    .. versionadded:: 1.2
+
+    Attributes
+    -----------
+    per_page: :class:`int`
+        The maximum amount of rows per page. Pages hold fewer rows when
+        the rendered rows would not fit in a single message.
+    index: :class:`int`
+        The index of the page currently shown.
+    pages: List[:class:`str`]
+        The pages rendered so far.
+    message: Optional[Union[:class:`~discord.Message`, :class:`LazyMessage`]]
+        The message the paginator is attached to.
+    """
+
+    def __init__(
+        self,
+        source: Union[AsyncIterable[T], Iterable[T]],
+        *,
+        user_id: int,
+        per_page: int = 10,
+        formatter: Callable[[T], Any] = str,
+        timeout: Optional[float] = 180.0,
+    ) -> None:
+        if per_page < 1:
+            raise ValueError('per_page must be at least 1')
+
+        super().__init__(timeout=timeout)
+        self.per_page: int = per_page
+        self.index: int = 0
+        self.pages: List[str] = []
+        self.message: Optional[Union[Message, LazyMessage]] = None
+        self._formatter: Callable[[T], Any] = formatter
+        self._user_id: int = user_id
+        self._source: AsyncIterator[T] = (
+            source.__aiter__() if isinstance(source, AsyncIterable) else _aiter(source)  # type: ignore
+        )
+        self._peeked: Any = MISSING
+        self._exhausted: bool = False
+        # Every button press runs in its own task, and a source can only be pulled from by one at a time
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    def __repr__(self) -> str:
+        return f'<Paginator index={self.index} pages={len(self.pages)} exhausted={self._exhausted}>'
+
+    @property
+    def has_next(self) -> bool:
+        """:class:`bool`: Whether there is a page after the current one."""
+        return self.index + 1 < len(self.pages) or self._peeked is not MISSING
+
+    async def _pull(self) -> Any:
+        row = self._peeked
+        if row is not MISSING:
+            self._peeked = MISSING
+            return row
+        if self._exhausted:
+            return MISSING
+        try:
+            return await self._source.__anext__()
+        except StopAsyncIteration:
+            self._exhausted = True
+            return MISSING
+
+    async def _load_page(self) -> bool:
+        lines: List[str] = []
+        length = -1  # The first line has no newline before it
+        while len(lines) < self.per_page:
+            row = await self._pull()
+            if row is MISSING:
+                break
+            line = str(self._formatter(row))[:MAX_CONTENT_LENGTH]
+            if lines and length + 1 + len(line) > MAX_CONTENT_LENGTH:
+                self._peeked = row
+                break
+            lines.append(line)
+            length += 1 + len(line)
+
+        if not lines:
+            return False
+        self.pages.append('\n'.join(lines))
+
+        # Pull one row ahead, so the last page is known to be the last one
+        if self._peeked is MISSING:
+            self._peeked = await self._pull()
+        return True
+
+    async def start(self) -> str:
+        # Renders the first page and returns its content, empty if the source has no rows at all
+        if not await self._load_page():
+            self.stop()
+            return ''
+        self._update_buttons()
+        return self.pages[0]
+
+    async def close(self) -> None:
+        """|coro|
+
+        Stops the paginator and closes the source if it is an asynchronous generator.
+        """
+        self.stop()
+        aclose = getattr(self._source, 'aclose', None)
+        if aclose is not None:
+            async with self._lock:
+                await aclose()
+
+    def _update_buttons(self) -> None:
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = not self.has_next
+        self.current_page.label = str(self.index + 1)
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        return interaction.user.id == self._user_id
+
+    async def on_timeout(self) -> None:
+        await self.close()
+        if self.message is not None:
+            try:
+                await self.message.edit(view=None)
+            except Exception:
+                pass
+
+    async def _show(self, interaction: Interaction) -> None:
+        self._update_buttons()
+        await interaction.response.edit_message(content=self.pages[self.index], view=self)
+
+    @ui.button(label='\N{BLACK LEFT-POINTING TRIANGLE}', style=ButtonStyle.secondary)
+    async def previous_page(self, interaction: Interaction, button: ui.Button) -> None:
+        async with self._lock:
+            if self.index > 0:
+                self.index -= 1
+            await self._show(interaction)
+
+    @ui.button(label='1', style=ButtonStyle.primary, disabled=True)
+    async def current_page(self, interaction: Interaction, button: ui.Button) -> None:
+        pass
+
+    @ui.button(label='\N{BLACK RIGHT-POINTING TRIANGLE}', style=ButtonStyle.secondary)
+    async def next_page(self, interaction: Interaction, button: ui.Button) -> None:
+        async with self._lock:
+            if self.index + 1 < len(self.pages) or await self._load_page():
+                self.index += 1
+            await self._show(interaction)
+
+    @ui.button(label='\N{BLACK SQUARE FOR STOP}', style=ButtonStyle.danger)
+    async def stop_pages(self, interaction: Interaction, button: ui.Button) -> None:
+        await self.close()
+        await interaction.response.edit_message(view=None)
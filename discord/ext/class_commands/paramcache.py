@@ -0,0 +1,368 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import io
+import os
+import pickle
+import sys
+from collections import OrderedDict
+from types import FunctionType, ModuleType
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Optional, Set, Tuple, Type, Union
+
+import discord
+from discord.app_commands.transformers import annotation_to_parameter
+from discord.utils import MISSING, resolve_annotation
+
+from .option import ParameterData
+
+if TYPE_CHECKING:
+    from importlib.machinery import ModuleSpec
+
+    from discord.app_commands.commands import CommandParameter
+
+    from .commands import Command
+
+    AnnotationKey = Tuple[str, Hashable]
+
+# fmt: off
+__all__ = (
+    'enable_parameter_cache',
+    'disable_parameter_cache',
+    'clear_parameter_cache',
+    'clear_annotation_cache',
+    'annotation_cache_info',
+)
+# fmt: on
+
+_SUFFIX = '.params'
+
+
+class _Pickler(pickle.Pickler):
+    # MISSING is compared by identity everywhere, so it has to come back as the same object,
+    # and the values of discord.py's enums are instances of classes that cannot be pickled
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # The modules of everything pickled, such as enums and transformers imported from elsewhere
+        self.modules: Set[Optional[str]] = set()
+
+    def persistent_id(self, obj: Any) -> Any:
+        self.modules.add(getattr(obj, '__module__', None) if isinstance(obj, type) else type(obj).__module__)
+        if obj is MISSING:
+            return 'MISSING'
+        enum = getattr(type(obj), '_actual_enum_cls_', None)
+        if enum is not None:
+            return enum.__module__, enum.__qualname__, obj.name
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def persistent_load(self, pid: Any) -> Any:
+        if pid == 'MISSING':
+            return MISSING
+        module, qualname, name = pid
+        return self.find_class(module, qualname)[name]
+
+
+class _ParameterCache:
+    __slots__ = ('directory', 'hits', 'misses', '_files')
+
+    def __init__(self) -> None:
+        self.directory: Optional[str] = None
+        self.hits: int = 0
+        self.misses: int = 0
+        self._files: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
+
+    def _file_digest(self, path: str) -> Optional[bytes]:
+        # Extensions are reloaded in place, so a digest is only reused while the file is unchanged
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        try:
+            cached, digest = self._files[path]
+        except KeyError:
+            pass
+        else:
+            if cached == signature:
+                return digest
+
+        try:
+            with open(path, 'rb') as fp:
+                digest = hashlib.sha256(fp.read()).digest()
+        except OSError:
+            return None
+        self._files[path] = signature, digest
+        return digest
+
+    def _module_digest(self, name: str) -> Optional[bytes]:
+        # Anything in the module can change how annotations resolve, so the whole file is part of the key
+        path = getattr(sys.modules.get(name), '__file__', None)
+        if path is None:
+            return None
+        return self._file_digest(path)
+
+    def key(self, cls: Type[Command]) -> Optional[str]:
+        module_digest = self._module_digest(cls.__module__)
+        if module_digest is None:
+            return None
+
+        from . import __version__
+
+        inputs = (
+            __version__,
+            discord.__version__,
+            sys.version_info[:2],
+            cls.__module__,
+            cls.__qualname__,
+            cls.__doc__,
+            # Evaluated annotations can have an unstable repr, the module digest covers them instead
+            [p.name for p in cls.__discord_app_commands_params__],
+            getattr(cls, '__discord_app_commands_param_description__', None),
+            getattr(cls, '__discord_app_commands_param_rename__', None),
+            getattr(cls, '__discord_app_commands_param_choices__', None),
+        )
+        digest = hashlib.sha256(module_digest)
+        # Options inherited from mixins in other modules resolve their annotations there
+        for name in sorted(set(getattr(cls, '__discord_app_commands_param_modules__', {}).values())):
+            mixin_digest = self._module_digest(name)
+            if mixin_digest is None:
+                return None
+            digest.update(mixin_digest)
+        digest.update(repr(inputs).encode())
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[Dict[str, CommandParameter]]:
+        path = os.path.join(self.directory, key + _SUFFIX)  # type: ignore # Only called when enabled
+        try:
+            with open(path, 'rb') as fp:
+                # The files the parameters were built from come first, so a stale entry is never unpickled
+                dependencies: Dict[str, bytes] = pickle.load(fp)
+                if any(self._file_digest(file) != digest for file, digest in dependencies.items()):
+                    raise ValueError('stale')
+                params = _Unpickler(fp).load()
+        except Exception:
+            # Missing, stale, corrupt or referring to something that no longer exists, either way it gets rebuilt
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return params
+
+    def store(self, key: str, params: Dict[str, CommandParameter], module: str) -> None:
+        buffer = io.BytesIO()
+        pickler = _Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+        try:
+            pickler.dump(params)
+        except Exception:
+            # Annotations that cannot be pickled are simply never cached
+            return
+
+        # Enums, transformers and the like can come from any module, and changing them changes the parameters.
+        # Those that are pickled by reference are known, but values such as a Range alias are pickled by value
+        # and could come from anywhere the command's module imports from, so those modules are included as well.
+        # discord.py and this library are covered by the versions in the key.
+        names = pickler.modules | _imported_modules(module)
+        dependencies = {}
+        for name in names:
+            if name is None or name in sys.builtin_module_names or name == 'discord' or name.startswith('discord.'):
+                continue
+            file = getattr(sys.modules.get(name), '__file__', None)
+            if file is None:
+                continue
+            digest = self._file_digest(file)
+            if digest is None:
+                return
+            dependencies[file] = digest
+
+        path = os.path.join(self.directory, key + _SUFFIX)  # type: ignore # Only called when enabled
+        temp = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(temp, 'wb') as fp:
+                pickle.dump(dependencies, fp, pickle.HIGHEST_PROTOCOL)
+                fp.write(buffer.getbuffer())
+            os.replace(temp, path)
+        except OSError:
+            pass
+
+
+def _imported_modules(name: str) -> Set[Optional[str]]:
+    # The modules loaded from the same top-level package, and those the module's globals were imported from
+    package = name.partition('.')[0]
+    names: Set[Optional[str]] = {n for n in list(sys.modules) if n == package or n.startswith(package + '.')}
+    namespace = getattr(sys.modules.get(name), '__dict__', {})
+    for value in list(namespace.values()):
+        if isinstance(value, ModuleType):
+            names.add(value.__name__)
+        elif isinstance(value, (type, FunctionType)):
+            names.add(value.__module__)
+    return names
+
+
+_parameter_cache = _ParameterCache()
+
+
+class _AnnotationCache:
+    # Resolving an annotation only depends on the annotation and the module it is written in,
+    # so commands sharing annotations share the work, and the resulting parameter when it has no default
+    __slots__ = ('max_size', 'hits', 'misses', '_entries')
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[AnnotationKey, Tuple[Optional[ModuleSpec], Any, CommandParameter]] = OrderedDict()
+
+    def parameter(self, module: str, parameter: ParameterData, cache: Dict[str, Any]) -> CommandParameter:
+        annotation = parameter.annotation
+        key = (module, annotation)
+        entries = self._entries
+        try:
+            entry = entries.get(key)
+        except TypeError:
+            # Unhashable annotations are rare enough to not be worth caching
+            globalns = vars(sys.modules[module])
+            return annotation_to_parameter(resolve_annotation(annotation, globalns, globalns, cache), parameter)
+
+        namespace = sys.modules[module]
+        # Reloading a module gives it a new spec, and names in it may now resolve to something else
+        spec = namespace.__spec__
+        if entry is None or entry[0] is not spec:
+            self.misses += 1
+            globalns = vars(namespace)
+            resolved = resolve_annotation(annotation, globalns, globalns, cache)
+            entry = entries[key] = (spec, resolved, annotation_to_parameter(resolved, _TEMPLATE))
+            entries.move_to_end(key)
+            if len(entries) > self.max_size:
+                entries.popitem(last=False)
+        else:
+            self.hits += 1
+            entries.move_to_end(key)
+
+        _, resolved, template = entry
+        if parameter.default is not parameter.empty:
+            # Defaults are validated against the annotation, so these go the long way
+            return annotation_to_parameter(resolved, parameter)
+
+        # Everything that is later populated is reassigned rather than mutated, so a shallow copy suffices
+        result = copy.copy(template)
+        result.name = parameter.name
+        return result
+
+
+_TEMPLATE = ParameterData('_')
+_annotation_cache = _AnnotationCache(1024)
+
+
+def clear_annotation_cache() -> None:
+    """Clears the process-wide cache of resolved option annotations.
+
+    Annotations are cached per module, so this only needs to be called when
+    a module that defines commands is reloaded, or a name used in annotations
+    is rebound after commands using it were defined.
+
+    .. versionadded:: 1.2
+    """
+    _annotation_cache._entries.clear()
+    _annotation_cache.hits = _annotation_cache.misses = 0
+
+
+def annotation_cache_info() -> Dict[str, int]:
+    """Returns statistics about the process-wide cache of resolved option annotations.
+
+    .. versionadded:: 1.2
+
+    Returns
+    --------
+    Dict[:class:`str`, :class:`int`]
+        The ``hits``, ``misses``, ``size`` and ``max_size`` of the cache.
+    """
+    return {
+        'hits': _annotation_cache.hits,
+        'misses': _annotation_cache.misses,
+        'size': len(_annotation_cache._entries),
+        'max_size': _annotation_cache.max_size,
+    }
+
+
+def enable_parameter_cache(directory: Union[str, os.PathLike[str]]) -> None:
+    """Enables caching the parameters of class-based commands on disk.
+
+    Resolving the annotations, descriptions, renames and choices of every option is skipped
+    for commands whose module, class and library versions are unchanged since the parameters
+    were cached, along with the modules their annotations come from, such as those defining
+    an :class:`enum.Enum` or a transformer. Anything else is resolved as usual, and cached for
+    the next start.
+
+    This must be called before the commands are defined, as their parameters are resolved
+    when their class is created.
+
+    .. warning::
+
+        The cache is stored using :mod:`pickle`, so the directory must not be writable by untrusted users.
+
+    .. versionadded:: 1.2
+
+    Parameters
+    -----------
+    directory: Union[:class:`str`, :class:`os.PathLike`]
+        The directory to store the cache in. It is created if it does not exist.
+    """
+    directory = os.fspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    _parameter_cache.directory = directory
+
+
+def disable_parameter_cache() -> None:
+    """Disables caching the parameters of class-based commands on disk.
+
+    .. versionadded:: 1.2
+    """
+    _parameter_cache.directory = None
+    _parameter_cache._files.clear()
+
+
+def clear_parameter_cache() -> None:
+    """Removes every cached parameter from the cache directory.
+
+    This does nothing if the cache is not enabled.
+
+    .. versionadded:: 1.2
+    """
+    _parameter_cache._files.clear()
+    directory = _parameter_cache.directory
+    if directory is None:
+        return
+
+    for name in os.listdir(directory):
+        if name.endswith(_SUFFIX):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
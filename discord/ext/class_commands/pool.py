@@ -0,0 +1,134 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Generic, List, Tuple, Type, TypeVar
+
+if TYPE_CHECKING:
+    from .commands import Command
+
+# fmt: off
+__all__ = (
+    'InstancePool',
+)
+# fmt: on
+
+CommandT = TypeVar('CommandT', bound='Command')
+
+
+class InstancePool(Generic[CommandT]):
+    """Represents a bounded free-list of command instances.
+
+    A pool is created for command classes defined with the ``pooled`` class keyword,
+    and can be retrieved through ``command.cls.pool``. Instances are taken from the pool
+    when an interaction starts and handed back once the callback completes or the error
+    handler has run, after being reset so no state leaks between invocations.
+
+    .. versionadded:: 1.2
+
+    Attributes
+    -----------
+    max_size: :class:`int`
+        The maximum amount of idle instances the pool holds on to.
+    hits: :class:`int`
+        The amount of times an idle instance was reused.
+    misses: :class:`int`
+        The amount of times a new instance had to be created.
+    """
+
+    __slots__ = ('cls', 'max_size', 'hits', 'misses', '_free', '_slots')
+
+    def __init__(self, cls: Type[CommandT], max_size: int) -> None:
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1')
+
+        self.cls: Type[CommandT] = cls
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._free: List[CommandT] = []
+        self._slots: Tuple[str, ...] = tuple(
+            slot
+            for klass in cls.__mro__
+            for slot in klass.__dict__.get('__slots__', ())
+            if slot not in ('__dict__', '__weakref__')
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f'<InstancePool cls={self.cls.__qualname__!r} size={len(self._free)} '
+            f'max_size={self.max_size} hits={self.hits} misses={self.misses}>'
+        )
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def acquire(self) -> CommandT:
+        """Takes an idle instance out of the pool, or creates a new one if there are none.
+
+        Returns
+        --------
+        :class:`Command`
+            A fresh command instance.
+        """
+        try:
+            inst = self._free.pop()
+        except IndexError:
+            self.misses += 1
+            return self.cls()
+        else:
+            self.hits += 1
+            return inst
+
+    def release(self, inst: CommandT) -> None:
+        """Resets an instance and hands it back to the pool.
+
+        The instance is discarded if the pool is already full.
+
+        Parameters
+        -----------
+        inst: :class:`Command`
+            The instance to release. It must not be used after this call.
+        """
+        if len(self._free) >= self.max_size:
+            return
+
+        for slot in self._slots:
+            try:
+                delattr(inst, slot)
+            except AttributeError:
+                pass
+        try:
+            inst.__dict__.clear()
+        except AttributeError:
+            pass
+        inst.__init__()
+        self._free.append(inst)
+
+    def clear(self) -> None:
+        """Drops all idle instances and resets the counters."""
+        self._free.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,226 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Hashable, Tuple, Union
+
+from discord import Interaction
+
+from .instrumentation import Histogram
+
+if TYPE_CHECKING:
+    from discord.abc import Messageable
+
+# fmt: off
+__all__ = (
+    'SendQueue',
+)
+# fmt: on
+
+
+class _Bucket:
+    # A token bucket that refills continuously, with a lock so sends leave in the order they were queued
+    __slots__ = ('rate', 'per', 'tokens', 'updated', 'lock', 'waiting')
+
+    def __init__(self, rate: int, per: float) -> None:
+        self.rate: int = rate
+        self.per: float = per
+        self.tokens: float = rate
+        self.updated: float = monotonic()
+        self.lock: asyncio.Lock = asyncio.Lock()
+        self.waiting: int = 0
+
+    def refill(self) -> float:
+        # Returns how long to wait for the next token
+        now = monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) * self.per / self.rate
+
+    def idle(self) -> bool:
+        return not self.waiting and not self.lock.locked() and monotonic() - self.updated >= self.per
+
+
+class SendQueue:
+    """Represents a queue that paces the messages sent by :meth:`Command.send`
+    to stay within Discord's rate limits, instead of retrying once they are hit.
+
+    Every destination gets a token bucket. Followups share a bucket per interaction,
+    and the messages sent to the channel once an interaction has expired share a bucket
+    per channel. Messages to the same destination are sent one at a time, in order.
+
+    Responding to an interaction is never queued, as it is not subject to these limits.
+
+    Commands opt in by assigning a queue to :attr:`Command.send_queue`:
+
+    .. code-block:: python3
+
+        queue = SendQueue()
+
+        class Announce(SlashCommand):
+            send_queue = queue
+
+    .. versionadded:: 1.2
+
+    Parameters
+    -----------
+    webhook_rate: :class:`int`
+        The amount of followups that can be sent per interaction within ``webhook_per`` seconds.
+        Defaults to ``5``.
+    webhook_per: :class:`float`
+        The amount of seconds it takes for the followup bucket to refill. Defaults to ``2``.
+    channel_rate: :class:`int`
+        The amount of messages that can be sent per channel within ``channel_per`` seconds.
+        Defaults to ``5``.
+    channel_per: :class:`float`
+        The amount of seconds it takes for the channel bucket to refill. Defaults to ``5``.
+    max_buckets: :class:`int`
+        The amount of buckets above which idle ones are discarded. Defaults to ``1024``.
+
+    Attributes
+    -----------
+    throttled: :class:`int`
+        The amount of messages that had to wait for their bucket to refill.
+    waits: :class:`Histogram`
+        The time messages spent in the queue before being sent.
+    """
+
+    __slots__ = (
+        'webhook_rate',
+        'webhook_per',
+        'channel_rate',
+        'channel_per',
+        'max_buckets',
+        'throttled',
+        'waits',
+        '_buckets',
+    )
+
+    def __init__(
+        self,
+        *,
+        webhook_rate: int = 5,
+        webhook_per: float = 2.0,
+        channel_rate: int = 5,
+        channel_per: float = 5.0,
+        max_buckets: int = 1024,
+    ) -> None:
+        if webhook_rate < 1 or channel_rate < 1:
+            raise ValueError('rates must be at least 1')
+
+        self.webhook_rate: int = webhook_rate
+        self.webhook_per: float = webhook_per
+        self.channel_rate: int = channel_rate
+        self.channel_per: float = channel_per
+        self.max_buckets: int = max_buckets
+        self.throttled: int = 0
+        self.waits: Histogram = Histogram()
+        self._buckets: Dict[Tuple[bool, Hashable], _Bucket] = {}
+
+    def __repr__(self) -> str:
+        return f'<SendQueue buckets={len(self._buckets)} depth={self.depth} throttled={self.throttled}>'
+
+    @property
+    def depth(self) -> int:
+        """:class:`int`: The amount of messages currently waiting to be sent."""
+        return sum(bucket.waiting for bucket in self._buckets.values())
+
+    def depth_of(self, destination: Union[Interaction, Messageable]) -> int:
+        """Returns the amount of messages currently waiting to be sent to a destination.
+
+        Parameters
+        -----------
+        destination: Union[:class:`~discord.Interaction`, :class:`~discord.abc.Messageable`]
+            The interaction to count followups for, or the channel to count messages for.
+
+        Returns
+        --------
+        :class:`int`
+            The amount of waiting messages.
+        """
+        bucket = self._buckets.get(self._key(destination))
+        return bucket.waiting if bucket is not None else 0
+
+    def _key(self, destination: Union[Interaction, Messageable]) -> Tuple[bool, Hashable]:
+        if isinstance(destination, Interaction):
+            return True, destination.token
+        return False, destination.id  # type: ignore # Every messageable the library sends to has an ID
+
+    def _get_bucket(self, key: Tuple[bool, Hashable]) -> _Bucket:
+        buckets = self._buckets
+        try:
+            return buckets[key]
+        except KeyError:
+            pass
+
+        if len(buckets) >= self.max_buckets:
+            for stale in [k for k, bucket in buckets.items() if bucket.idle()]:
+                del buckets[stale]
+
+        if key[0]:
+            bucket = buckets[key] = _Bucket(self.webhook_rate, self.webhook_per)
+        else:
+            bucket = buckets[key] = _Bucket(self.channel_rate, self.channel_per)
+        return bucket
+
+    @asynccontextmanager
+    async def reserve(self, destination: Union[Interaction, Messageable]) -> AsyncIterator[None]:
+        """Waits until a message can be sent to a destination, and holds its place in line
+        until the block exits.
+
+        This is used by :meth:`Command.send`, but can be used to pace other messages as well:
+
+        .. code-block:: python3
+
+            async with queue.reserve(channel):
+                await channel.send('Hello!')
+
+        Parameters
+        -----------
+        destination: Union[:class:`~discord.Interaction`, :class:`~discord.abc.Messageable`]
+            The interaction a followup is sent for, or the channel a message is sent to.
+        """
+        bucket = self._get_bucket(self._key(destination))
+        start = perf_counter()
+        bucket.waiting += 1
+        try:
+            await bucket.lock.acquire()
+        finally:
+            bucket.waiting -= 1
+
+        try:
+            delay = bucket.refill()
+            if delay:
+                self.throttled += 1
+                await asyncio.sleep(delay)
+                bucket.refill()
+            bucket.tokens -= 1
+            self.waits.record(perf_counter() - start)
+            yield
+        finally:
+            bucket.lock.release()
@@ -0,0 +1,213 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Set, Tuple, Union
+
+from discord.app_commands import Choice
+
+# fmt: off
+__all__ = (
+    'ChoiceIndex',
+)
+# fmt: on
+
+ChoiceLike = Union[str, Choice[Any]]
+
+
+def _grams(text: str) -> Set[str]:
+    padded = f' {text} '
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class ChoiceIndex:
+    """Represents a searchable index over a large set of choices.
+
+    Lookups first return choices whose name starts with the query, using a sorted array,
+    and then fill up the remaining slots with fuzzy matches found through a trigram index.
+    Matching is case-insensitive.
+
+    This is usually created implicitly by passing an iterable to the ``source`` parameter
+    of :class:`Option`, but can be created beforehand to share it between options or to
+    update it later on.
+
+    .. versionadded:: 1.2
+
+    Parameters
+    -----------
+    source: Iterable[Union[:class:`str`, :class:`~discord.app_commands.Choice`]]
+        The choices to index. Strings are used as both the name and the value.
+    threshold: :class:`float`
+        The minimum fraction, between 0 and 1, of the query's trigrams a name must
+        contain to be returned as a fuzzy match. Defaults to ``0.3``.
+    """
+
+    __slots__ = ('threshold', '_choices', '_keys', '_grams', '_gram_counts')
+
+    def __init__(self, source: Iterable[ChoiceLike] = (), *, threshold: float = 0.3) -> None:
+        self.threshold: float = threshold
+        self._choices: Dict[str, Choice[Any]] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._grams: Dict[str, Set[str]] = {}
+        self._gram_counts: Dict[str, int] = {}
+
+        # Building everything in bulk is much faster than adding choices one by one
+        for choice in map(self._to_choice, source):
+            self._choices[choice.name] = choice
+        self._keys = sorted((name.casefold(), name) for name in self._choices)
+        for folded, name in self._keys:
+            self._index_grams(folded, name)
+
+    def __repr__(self) -> str:
+        return f'<ChoiceIndex size={len(self._choices)}>'
+
+    def __len__(self) -> int:
+        return len(self._choices)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._choices
+
+    @staticmethod
+    def _to_choice(item: ChoiceLike) -> Choice[Any]:
+        if isinstance(item, Choice):
+            return item
+        return Choice(name=str(item), value=item)
+
+    def _index_grams(self, folded: str, name: str) -> None:
+        grams = _grams(folded)
+        self._gram_counts[name] = len(grams)
+        for gram in grams:
+            try:
+                self._grams[gram].add(name)
+            except KeyError:
+                self._grams[gram] = {name}
+
+    def _discard(self, name: str) -> None:
+        if self._choices.pop(name, None) is None:
+            return
+
+        folded = name.casefold()
+        keys = self._keys
+        index = bisect_left(keys, (folded, name))
+        del keys[index]
+
+        del self._gram_counts[name]
+        for gram in _grams(folded):
+            names = self._grams[gram]
+            names.discard(name)
+            if not names:
+                del self._grams[gram]
+
+    def add(self, choices: Iterable[ChoiceLike]) -> None:
+        """Adds choices to the index. Choices with an already indexed name replace the existing one.
+
+        Parameters
+        -----------
+        choices: Iterable[Union[:class:`str`, :class:`~discord.app_commands.Choice`]]
+            The choices to add.
+        """
+        for choice in map(self._to_choice, choices):
+            name = choice.name
+            self._discard(name)
+            self._choices[name] = choice
+            folded = name.casefold()
+            insort(self._keys, (folded, name))
+            self._index_grams(folded, name)
+
+    def remove(self, names: Iterable[str]) -> None:
+        """Removes choices from the index. Names that are not indexed are ignored.
+
+        Parameters
+        -----------
+        names: Iterable[:class:`str`]
+            The names of the choices to remove.
+        """
+        for name in names:
+            self._discard(name)
+
+    def search(self, query: str, *, limit: int = 25) -> List[Choice[Any]]:
+        """Returns the choices that best match the query.
+
+        Parameters
+        -----------
+        query: :class:`str`
+            What the user typed so far.
+        limit: :class:`int`
+            The maximum amount of choices to return. Defaults to ``25``,
+            the maximum amount Discord displays.
+
+        Returns
+        --------
+        List[:class:`~discord.app_commands.Choice`]
+            Choices starting with the query in alphabetical order, followed by fuzzy matches.
+        """
+        choices = self._choices
+        query = query.casefold().strip()
+        if not query:
+            return list(islice(choices.values(), limit))
+
+        keys = self._keys
+        found: List[str] = []
+        index = bisect_left(keys, (query,))
+        while index < len(keys) and len(found) < limit:
+            folded, name = keys[index]
+            if not folded.startswith(query):
+                break
+            found.append(name)
+            index += 1
+
+        if len(found) < limit:
+            found += self._fuzzy(query, limit - len(found), set(found))
+
+        return [choices[name] for name in found]
+
+    def _fuzzy(self, query: str, limit: int, exclude: Set[str]) -> List[str]:
+        grams = _grams(query)
+        index = self._grams
+        counts: Counter[str] = Counter()
+        for gram in grams:
+            try:
+                counts.update(index[gram])
+            except KeyError:
+                pass
+
+        total = len(grams)
+        gram_counts = self._gram_counts
+        threshold = self.threshold
+        scored = []
+        for name, shared in counts.items():
+            if name in exclude:
+                continue
+            # Rank on how much of the query is found in the name, so partial words still match,
+            # then on the Jaccard similarity of the trigram sets to prefer names of a similar length
+            contained = shared / total
+            if contained >= threshold:
+                scored.append((contained, shared / (total + gram_counts[name] - shared), name))
+
+        return [name for _, _, name in heapq.nlargest(limit, scored)]
@@ -0,0 +1,215 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Awaitable, List, Optional, Union
+
+from .output import _split_content
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from discord import Message
+
+    from .commands import Command
+    from .message import LazyMessage
+
+# fmt: off
+__all__ = (
+    'ResponseStream',
+)
+# fmt: on
+
+
+class ResponseStream:
+    """Represents a response that is edited as its content changes, at a limited rate.
+
+    This is returned by :meth:`Command.stream` and is meant to be used as an asynchronous
+    context manager. Updates are coalesced, so the response is edited at most once every
+    ``interval`` seconds with whatever the latest content is. The latest content is always
+    delivered, at the latest when the context manager exits.
+
+    Content that does not fit in a single message overflows into followup messages,
+    which are edited the same way. Messages left over when the content shrinks are deleted.
+
+    .. versionadded:: 1.2
+
+    Attributes
+    -----------
+    command: :class:`Command`
+        The command the response is sent for.
+    interval: :class:`float`
+        The minimum amount of seconds between edits.
+    ephemeral: :class:`bool`
+        Whether the messages are ephemeral.
+    messages: List[Union[:class:`~discord.Message`, :class:`LazyMessage`]]
+        The messages sent so far.
+    """
+
+    __slots__ = ('command', 'interval', 'ephemeral', 'messages', '_content', '_sent', '_last', '_task', '_error')
+
+    def __init__(self, command: Command, *, interval: float = 1.0, ephemeral: bool = False) -> None:
+        self.command: Command = command
+        self.interval: float = interval
+        self.ephemeral: bool = ephemeral
+        self.messages: List[Union[Message, LazyMessage]] = []
+        self._content: str = ''
+        self._sent: List[str] = []
+        self._last: float = -interval
+        self._task: Optional[asyncio.Task[None]] = None
+        self._error: Optional[BaseException] = None
+
+    def __repr__(self) -> str:
+        return f'<ResponseStream command={self.command!r} interval={self.interval} sent={len(self.messages)}>'
+
+    async def __aenter__(self) -> ResponseStream:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.flush()
+
+    @property
+    def content(self) -> str:
+        """:class:`str`: The latest content of the response."""
+        return self._content
+
+    async def update(self, content: Any) -> None:
+        """|coro|
+
+        Replaces the content of the response.
+
+        This returns right away, the response is edited in the background
+        once the rate allows it.
+
+        Parameters
+        -----------
+        content: :class:`str`
+            The new content. This is converted to a string.
+
+        Raises
+        -------
+        ~discord.HTTPException
+            Sending or editing a previous update failed.
+        """
+        self._raise()
+        self._content = str(content)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def write(self, content: Any) -> None:
+        """|coro|
+
+        Appends to the content of the response. This works like :meth:`update`.
+
+        Parameters
+        -----------
+        content: :class:`str`
+            The content to append. This is converted to a string.
+
+        Raises
+        -------
+        ~discord.HTTPException
+            Sending or editing a previous update failed.
+        """
+        await self.update(self._content + str(content))
+
+    async def flush(self) -> None:
+        """|coro|
+
+        Waits until the latest content has been delivered, respecting the edit rate.
+
+        Raises
+        -------
+        ~discord.HTTPException
+            Sending or editing the response failed.
+        """
+        if self._task is None and self._error is None and self._pending():
+            self._task = asyncio.create_task(self._run())
+        while self._task is not None:
+            await self._task
+        self._raise()
+
+    def _raise(self) -> None:
+        error = self._error
+        if error is not None:
+            self._error = None
+            raise error
+
+    def _pages(self) -> List[str]:
+        pages, rest = _split_content(self._content)
+        if rest:
+            pages.append(rest)
+        return pages
+
+    def _pending(self) -> bool:
+        return self._pages() != self._sent
+
+    async def _run(self) -> None:
+        # A single task delivers the updates, whatever was updated while it waited is coalesced into one edit
+        try:
+            while self._pending():
+                delay = self._last + self.interval - monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self._deliver()
+        except Exception as exc:
+            self._error = exc
+        finally:
+            self._task = None
+
+    async def _deliver(self) -> None:
+        self._last = monotonic()
+        command = self.command
+        sent = self._sent
+        messages = self.messages
+        pages = self._pages()
+        for index, page in enumerate(pages):
+            if index >= len(sent):
+                messages.append(await command.send(page, ephemeral=self.ephemeral, fetch=False))
+                sent.append(page)
+            elif sent[index] != page:
+                await self._paced(messages[index].edit(content=page))
+                sent[index] = page
+
+        # Content that shrank leaves messages behind that no longer have a page
+        while len(sent) > len(pages):
+            sent.pop()
+            await self._paced(messages.pop().delete())
+
+    async def _paced(self, coro: Awaitable[Any]) -> None:
+        queue = self.command.send_queue
+        if queue is None:
+            await coro
+        else:
+            # Edits and deletions count towards the same limits as followups
+            async with queue.reserve(self.command.interaction):
+                await coro
@@ -0,0 +1,462 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from discord import Object
+from discord.app_commands import AppCommand
+from discord.app_commands.errors import MissingApplicationID
+from discord.utils import maybe_coroutine
+
+from .ratelimit import _Bucket
+
+if TYPE_CHECKING:
+    from discord.abc import Snowflake
+    from discord.app_commands import CommandTree, ContextMenu, Group
+    from discord.app_commands import Command as AppCommandT
+    from discord.app_commands.translator import Translator
+
+    Syncable = Union[AppCommandT[Any, ..., Any], Group, ContextMenu]
+    ProgressCallback = Callable[[Optional[int], Optional[Exception], int, int], Any]
+
+# fmt: off
+__all__ = (
+    'CommandSyncer',
+    'SyncFailure',
+    'fingerprint',
+)
+# fmt: on
+
+
+async def _payload(command: Syncable, translator: Optional[Translator]) -> Dict[str, Any]:
+    # The same payload CommandTree.sync would send
+    if translator is not None:
+        return await command.get_translated_payload(translator)
+    return command.to_dict()
+
+
+def _digest(payload: Any) -> str:
+    data = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+async def fingerprint(command: Syncable, *, translator: Optional[Translator] = None) -> str:
+    """|coro|
+
+    Returns a stable fingerprint of the payload a command is synced with.
+
+    The fingerprint only changes when the command would be synced differently,
+    and is the same across processes and restarts.
+
+    .. versionadded:: 1.2
+
+    Parameters
+    -----------
+    command: Union[:class:`~discord.app_commands.Command`, :class:`~discord.app_commands.ContextMenu`]
+        The command to fingerprint, such as a class-based command. Groups are supported as well.
+    translator: Optional[:class:`~discord.app_commands.Translator`]
+        The translator the command is synced with, if any.
+
+    Returns
+    --------
+    :class:`str`
+        The hexadecimal fingerprint.
+    """
+    return _digest(await _payload(command, translator))
+
+
+class SyncFailure(Exception):
+    """An exception raised when syncing some of the scopes in :meth:`CommandSyncer.sync_all` failed.
+
+    .. versionadded:: 1.2
+
+    Attributes
+    -----------
+    results: Dict[Optional[:class:`int`], Optional[List[:class:`~discord.app_commands.AppCommand`]]]
+        The results of the scopes that were synced, as returned by :meth:`CommandSyncer.sync_all`.
+    failures: Dict[Optional[:class:`int`], :class:`Exception`]
+        A mapping of guild IDs, or ``None`` for the global commands, to the exception they failed with.
+    """
+
+    def __init__(
+        self,
+        results: Dict[Optional[int], Optional[List[AppCommand]]],
+        failures: Dict[Optional[int], Exception],
+    ) -> None:
+        self.results: Dict[Optional[int], Optional[List[AppCommand]]] = results
+        self.failures: Dict[Optional[int], Exception] = failures
+        super().__init__(f'Syncing {len(failures)} out of {len(results) + len(failures)} scopes failed')
+
+
+class CommandSyncer:
+    """Syncs the commands of a :class:`~discord.app_commands.CommandTree`, skipping
+    scopes whose commands have not changed since they were last synced.
+
+    Every scope (the global commands, or the commands of a single guild) gets a fingerprint
+    of its commands. The fingerprints of the last successful syncs are stored in a JSON file,
+    so unchanged scopes are skipped across restarts and processes sharing the file.
+
+    Commands added with the ``guild`` or ``guilds`` class keywords belong to the scope of each of their guilds.
+
+    In incremental mode, the file also holds the IDs Discord gave the commands of each scope.
+    Only the commands that were added, changed or removed since are then created, edited or
+    deleted, one request each, instead of overwriting every command of the scope. When more
+    than ``max_requests`` requests would be needed, or nothing is known about a scope yet,
+    the scope is overwritten in a single request as usual.
+
+    .. versionadded:: 1.2
+
+    Parameters
+    -----------
+    tree: :class:`~discord.app_commands.CommandTree`
+        The tree to sync.
+    path: Union[:class:`str`, :class:`os.PathLike`]
+        The file the fingerprints are stored in. It is created on the first sync.
+    incremental: :class:`bool`
+        Whether to only send the commands that changed. Defaults to ``False``.
+    max_requests: :class:`int`
+        The maximum amount of requests an incremental sync of a scope may take. Defaults to ``5``.
+
+    Attributes
+    -----------
+    tree: :class:`~discord.app_commands.CommandTree`
+        The tree to sync.
+    path: :class:`str`
+        The file the fingerprints are stored in.
+    incremental: :class:`bool`
+        Whether to only send the commands that changed.
+    max_requests: :class:`int`
+        The maximum amount of requests an incremental sync of a scope may take.
+    """
+
+    __slots__ = ('tree', 'path', 'incremental', 'max_requests', '_state')
+
+    def __init__(
+        self,
+        tree: CommandTree[Any],
+        path: Union[str, os.PathLike[str]],
+        *,
+        incremental: bool = False,
+        max_requests: int = 5,
+    ) -> None:
+        self.tree: CommandTree[Any] = tree
+        self.path: str = os.fspath(path)
+        self.incremental: bool = incremental
+        self.max_requests: int = max_requests
+        self._state: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def __repr__(self) -> str:
+        return f'<CommandSyncer path={self.path!r} incremental={self.incremental}>'
+
+    @staticmethod
+    def _scope(guild: Optional[Snowflake]) -> str:
+        return 'global' if guild is None else str(guild.id)
+
+    @staticmethod
+    def _key(command: Union[Syncable, AppCommand]) -> str:
+        kind = getattr(command, 'type', None)
+        return f'{kind.value if kind is not None else 1}:{command.name}'
+
+    def _application(self) -> Dict[str, Any]:
+        # Different applications can share the same file
+        if self._state is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as fp:
+                    self._state = json.load(fp)
+            except (OSError, ValueError):
+                self._state = {}
+        return self._state.setdefault(str(self.tree.client.application_id), {})  # type: ignore # Loaded above
+
+    def _save(self) -> None:
+        temp = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp, 'w', encoding='utf-8') as fp:
+            json.dump(self._state, fp, indent=2, sort_keys=True)
+        os.replace(temp, self.path)
+
+    @property
+    def guilds(self) -> List[Object]:
+        """List[:class:`~discord.Object`]: The guilds the tree has commands for."""
+        tree = self.tree
+        ids: Set[int] = set(tree._guild_commands)
+        ids.update(guild_id for _, guild_id, _ in tree._context_menus if guild_id is not None)
+        return [Object(id=guild_id) for guild_id in sorted(ids)]
+
+    async def _payloads(self, guild: Optional[Snowflake]) -> Dict[str, Dict[str, Any]]:
+        translator = self.tree.translator
+        return {
+            self._key(command): await _payload(command, translator) for command in self.tree._get_all_commands(guild=guild)
+        }
+
+    async def fingerprints(self, *, guild: Optional[Snowflake] = None) -> Dict[str, str]:
+        """|coro|
+
+        Returns the fingerprint of every command in a scope.
+
+        Parameters
+        -----------
+        guild: Optional[:class:`~discord.abc.Snowflake`]
+            The guild to fingerprint the commands of. If ``None`` then the global commands are used.
+
+        Returns
+        --------
+        Dict[:class:`str`, :class:`str`]
+            A mapping of ``type:name`` keys to fingerprints.
+        """
+        return {key: _digest(payload) for key, payload in (await self._payloads(guild)).items()}
+
+    async def fingerprint(self, *, guild: Optional[Snowflake] = None) -> str:
+        """|coro|
+
+        Returns the fingerprint of a scope as a whole.
+
+        Parameters
+        -----------
+        guild: Optional[:class:`~discord.abc.Snowflake`]
+            The guild to fingerprint. If ``None`` then the global commands are fingerprinted.
+
+        Returns
+        --------
+        :class:`str`
+            The hexadecimal fingerprint.
+        """
+        return _digest(sorted((await self.fingerprints(guild=guild)).items()))
+
+    async def changed(self, *, guild: Optional[Snowflake] = None) -> bool:
+        """|coro|
+
+        Returns whether a scope changed since it was last synced.
+
+        Parameters
+        -----------
+        guild: Optional[:class:`~discord.abc.Snowflake`]
+            The guild to check. If ``None`` then the global commands are checked.
+
+        Returns
+        --------
+        :class:`bool`
+            Whether the scope needs to be synced.
+        """
+        entry = self._application().get(self._scope(guild))
+        return entry is None or entry['fingerprint'] != await self.fingerprint(guild=guild)
+
+    async def sync(self, *, guild: Optional[Snowflake] = None, force: bool = False) -> Optional[List[AppCommand]]:
+        """|coro|
+
+        Syncs a scope if its commands changed since it was last synced.
+
+        Scopes are overwritten through :meth:`CommandTree.sync() <discord.app_commands.CommandTree.sync>`,
+        unless they can be synced incrementally.
+
+        Parameters
+        -----------
+        guild: Optional[:class:`~discord.abc.Snowflake`]
+            The guild to sync. If ``None`` then the global commands are synced.
+        force: :class:`bool`
+            Whether to overwrite the scope even if nothing changed.
+
+        Raises
+        -------
+        ~discord.HTTPException
+            Syncing the commands failed. The scope is synced again next time,
+            skipping the requests of an incremental sync that succeeded.
+
+        Returns
+        --------
+        Optional[List[:class:`~discord.app_commands.AppCommand`]]
+            The commands that got created, edited or overwritten, or ``None`` if the sync was skipped.
+        """
+        payloads = await self._payloads(guild)
+        fingerprints = {key: _digest(payload) for key, payload in payloads.items()}
+        current = _digest(sorted(fingerprints.items()))
+
+        state = self._application()
+        scope = self._scope(guild)
+        entry = state.get(scope)
+        if not force and entry is not None and entry['fingerprint'] == current:
+            return None
+
+        if self.incremental and not force and entry is not None:
+            snapshot: Dict[str, Tuple[str, str]] = entry['commands']
+            changes = sum(1 for key in snapshot if key not in fingerprints)
+            changes += sum(1 for key, value in fingerprints.items() if snapshot.get(key, (None, None))[1] != value)
+            if changes <= self.max_requests:
+                try:
+                    commands = await self._sync_changes(guild, payloads, fingerprints, snapshot)
+                finally:
+                    # Requests that went through are not repeated next time, even if a later one failed
+                    self._save()
+                entry['fingerprint'] = current
+                self._save()
+                return commands
+
+        commands = await self.tree.sync(guild=guild)
+        state[scope] = {
+            'fingerprint': current,
+            'commands': {
+                self._key(command): (str(command.id), fingerprints.get(self._key(command))) for command in commands
+            },
+        }
+        self._save()
+        return commands
+
+    async def _sync_changes(
+        self,
+        guild: Optional[Snowflake],
+        payloads: Dict[str, Dict[str, Any]],
+        fingerprints: Dict[str, str],
+        snapshot: Dict[str, Tuple[str, str]],
+    ) -> List[AppCommand]:
+        # Requests are sent one at a time, so discord.py's rate limit handling sees each of them in turn
+        tree = self.tree
+        http = tree._http
+        application_id = tree.client.application_id
+        if application_id is None:
+            raise MissingApplicationID
+
+        result: List[AppCommand] = []
+        for key in [key for key in snapshot if key not in fingerprints]:
+            command_id = snapshot[key][0]
+            if guild is None:
+                await http.delete_global_command(application_id, command_id)
+            else:
+                await http.delete_guild_command(application_id, guild.id, command_id)
+            del snapshot[key]
+
+        for key, payload in payloads.items():
+            value = fingerprints[key]
+            previous = snapshot.get(key)
+            if previous is not None and previous[1] == value:
+                continue
+
+            if previous is None:
+                if guild is None:
+                    data = await http.upsert_global_command(application_id, payload)  # type: ignore # Payload is a command
+                else:
+                    data = await http.upsert_guild_command(application_id, guild.id, payload)
+            elif guild is None:
+                data = await http.edit_global_command(application_id, previous[0], payload)
+            else:
+                data = await http.edit_guild_command(application_id, guild.id, previous[0], payload)
+
+            command = AppCommand(data=data, state=tree._state)
+            snapshot[key] = (str(command.id), value)
+            result.append(command)
+        return result
+
+    async def sync_all(
+        self,
+        *,
+        force: bool = False,
+        concurrency: int = 4,
+        rate: int = 10,
+        per: float = 1.0,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[Optional[int], Optional[List[AppCommand]]]:
+        """|coro|
+
+        Syncs the global commands and the commands of every guild in :attr:`guilds`
+        that changed since they were last synced.
+
+        Guilds that were synced before but no longer have commands are synced as well,
+        which removes their commands.
+
+        Scopes are synced concurrently, and a failing scope does not stop the others.
+        As every scope is recorded as soon as it is synced, calling this again after
+        a failure only syncs the scopes that did not make it.
+
+        .. versionchanged:: 1.2
+            Added the ``concurrency``, ``rate``, ``per`` and ``progress`` parameters.
+
+        Parameters
+        -----------
+        force: :class:`bool`
+            Whether to overwrite every scope even if nothing changed.
+        concurrency: :class:`int`
+            The maximum amount of scopes synced at the same time. Defaults to ``4``.
+        rate: :class:`int`
+            The maximum amount of scope syncs started within ``per`` seconds. Defaults to ``10``.
+        per: :class:`float`
+            The amount of seconds ``rate`` applies to. Defaults to ``1``.
+        progress: Optional[Callable[[Optional[:class:`int`], Optional[:class:`Exception`], :class:`int`, :class:`int`], Any]]
+            A function, or coroutine function, called after every scope with its guild ID (``None`` for the
+            global commands), the exception it failed with if any, the amount of scopes done and the total.
+
+        Raises
+        -------
+        SyncFailure
+            Syncing some of the scopes failed.
+
+        Returns
+        --------
+        Dict[Optional[:class:`int`], Optional[List[:class:`~discord.app_commands.AppCommand`]]]
+            A mapping of guild IDs, or ``None`` for the global commands, to the result of :meth:`sync`.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+
+        scopes: List[Optional[Object]] = [None, *self._all_guilds()]
+        total = len(scopes)
+        bucket = _Bucket(rate, per)
+        semaphore = asyncio.Semaphore(concurrency)
+        results: Dict[Optional[int], Optional[List[AppCommand]]] = {}
+        failures: Dict[Optional[int], Exception] = {}
+
+        async def run(guild: Optional[Object]) -> None:
+            guild_id = guild.id if guild is not None else None
+            error = None
+            async with semaphore:
+                try:
+                    if force or await self.changed(guild=guild):
+                        # Only scopes that make requests count towards the rate
+                        async with bucket.lock:
+                            delay = bucket.refill()
+                            if delay:
+                                await asyncio.sleep(delay)
+                                bucket.refill()
+                            bucket.tokens -= 1
+                        results[guild_id] = await self.sync(guild=guild, force=force)
+                    else:
+                        results[guild_id] = None
+                except Exception as exc:
+                    failures[guild_id] = error = exc
+
+            if progress is not None:
+                await maybe_coroutine(progress, guild_id, error, len(results) + len(failures), total)
+
+        await asyncio.gather(*(run(guild) for guild in scopes))
+        if failures:
+            raise SyncFailure(results, failures)
+        return results
+
+    def _all_guilds(self) -> List[Object]:
+        # Guilds that were synced before but have no commands anymore still need their commands removed
+        ids = {guild.id for guild in self.guilds}
+        ids.update(int(scope) for scope in self._application() if scope != 'global')
+        return [Object(id=guild_id) for guild_id in sorted(ids)]
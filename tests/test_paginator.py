@@ -0,0 +1,70 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import unittest
+from typing import Any, AsyncIterator, Dict
+
+from discord.ext.class_commands import Paginator
+
+
+class FakeResponse:
+    def __init__(self) -> None:
+        self.edited: Dict[str, Any] = {}
+
+    async def edit_message(self, **kwargs: Any) -> None:
+        self.edited = kwargs
+
+
+class FakeInteraction:
+    def __init__(self) -> None:
+        self.response = FakeResponse()
+
+
+async def slow_rows(amount: int) -> AsyncIterator[int]:
+    for row in range(amount):
+        await asyncio.sleep(0.001)
+        yield row
+
+
+class PaginatorTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_next(self) -> None:
+        paginator = Paginator(slow_rows(20), user_id=1, per_page=5)
+        self.assertEqual(await paginator.start(), '0\n1\n2\n3\n4')
+
+        # Quick clicks are dispatched as separate tasks pulling from the same generator
+        first, second = FakeInteraction(), FakeInteraction()
+        await asyncio.gather(paginator.next_page.callback(first), paginator.next_page.callback(second))  # type: ignore
+
+        self.assertEqual(paginator.index, 2)
+        self.assertEqual(paginator.pages, ['0\n1\n2\n3\n4', '5\n6\n7\n8\n9', '10\n11\n12\n13\n14'])
+        self.assertEqual(first.response.edited['content'], paginator.pages[1])
+        self.assertEqual(second.response.edited['content'], paginator.pages[2])
+        await paginator.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from typing import Any, List
+
+from discord.ext.class_commands import clear_annotation_cache, disable_parameter_cache, enable_parameter_cache
+from discord.ext.class_commands.paramcache import _parameter_cache
+
+COMMANDS = '''
+from __future__ import annotations
+
+from discord.ext.class_commands import Option, SlashCommand
+
+from .types_ import Color
+
+
+class Paint(SlashCommand):
+    color: Color = Option()
+
+    async def callback(self):
+        pass
+'''
+
+TYPES = '''
+import enum
+
+
+class Color(enum.Enum):
+{}
+'''
+
+
+class ParameterCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        self.package = os.path.join(self.root, 'paramcache_pkg')
+        os.mkdir(self.package)
+        with open(os.path.join(self.package, '__init__.py'), 'w'):
+            pass
+        with open(os.path.join(self.package, 'commands.py'), 'w') as fp:
+            fp.write(COMMANDS)
+
+        sys.path.insert(0, self.root)
+        self.addCleanup(sys.path.remove, self.root)
+        self.addCleanup(self._unload)
+        enable_parameter_cache(os.path.join(self.root, 'cache'))
+        self.addCleanup(disable_parameter_cache)
+
+    def _unload(self) -> None:
+        for name in [name for name in sys.modules if name.startswith('paramcache_pkg')]:
+            del sys.modules[name]
+
+    def _choices(self, *colors: str) -> List[Any]:
+        # A fresh start, with only the cache on disk carried over
+        with open(os.path.join(self.package, 'types_.py'), 'w') as fp:
+            fp.write(TYPES.format('\n'.join(f'    {color} = {color!r}' for color in colors)))
+        self._unload()
+        clear_annotation_cache()
+        importlib.invalidate_caches()
+        module = importlib.import_module('paramcache_pkg.commands')
+        return [choice['name'] for choice in module.Paint.to_dict()['options'][0]['choices']]
+
+    def test_annotation_module_changed(self) -> None:
+        self.assertEqual(self._choices('red', 'blue'), ['red', 'blue'])
+        hits = _parameter_cache.hits
+        self.assertEqual(self._choices('red', 'blue'), ['red', 'blue'])
+        self.assertEqual(_parameter_cache.hits, hits + 1)
+
+        # The enum lives in another module than the command, changing it must not be served from the cache
+        self.assertEqual(self._choices('red', 'blue', 'green'), ['red', 'blue', 'green'])
+        self.assertEqual(_parameter_cache.hits, hits + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
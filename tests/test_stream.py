@@ -0,0 +1,86 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import unittest
+from typing import Any, List, Optional
+
+from discord.ext.class_commands import ResponseStream
+
+
+class FakeMessage:
+    def __init__(self, command: FakeCommand, content: str) -> None:
+        self.command = command
+        self.content = content
+
+    async def edit(self, *, content: str) -> None:
+        self.content = content
+
+    async def delete(self) -> None:
+        self.command.deleted.append(self)
+
+
+class FakeCommand:
+    send_queue = None
+    interaction = None
+
+    def __init__(self) -> None:
+        self.sent: List[FakeMessage] = []
+        self.deleted: List[FakeMessage] = []
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> FakeMessage:
+        message = FakeMessage(self, content)  # type: ignore
+        self.sent.append(message)
+        return message
+
+
+class ResponseStreamTest(unittest.IsolatedAsyncioTestCase):
+    async def test_overflow(self) -> None:
+        command = FakeCommand()
+        async with ResponseStream(command, interval=0) as stream:  # type: ignore
+            await stream.update('a' * 2500)
+
+        self.assertEqual([len(m.content) for m in stream.messages], [2000, 500])
+        self.assertEqual(command.deleted, [])
+
+    async def test_shrink(self) -> None:
+        command = FakeCommand()
+        stream = ResponseStream(command, interval=0.01)  # type: ignore
+        await stream.update('a' * 2500)
+        await asyncio.wait_for(stream.flush(), 1)
+        first, second = stream.messages
+
+        await stream.update('short')
+        await asyncio.wait_for(stream.flush(), 1)
+
+        self.assertEqual(stream.messages, [first])
+        self.assertEqual(first.content, 'short')
+        self.assertEqual(command.deleted, [second])
+        self.assertFalse(stream._pending())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present Dolfies
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import discord
+from discord import app_commands
+from discord.ext.class_commands import CommandSyncer, SlashCommand, SyncFailure
+
+
+class StubHTTP:
+    # Records the requests CommandTree.sync and CommandSyncer would send, and answers them like Discord
+    def __init__(self) -> None:
+        self.requests: List[Tuple[Any, ...]] = []
+        self.failing: Set[Optional[int]] = set()
+        self._ids = itertools.count(100)
+
+    def _command(self, payload: Dict[str, Any], guild_id: Optional[int] = None, command_id: Any = None) -> Dict[str, Any]:
+        return {
+            **payload,
+            'id': command_id or next(self._ids),
+            'application_id': 1,
+            'guild_id': guild_id,
+        }
+
+    def _request(self, *request: Any, guild_id: Optional[int] = None) -> None:
+        self.requests.append(request)
+        if guild_id in self.failing:
+            raise RuntimeError(f'Syncing {guild_id} failed')
+
+    async def bulk_upsert_global_commands(self, application_id: int, payload: List[Any]) -> List[Any]:
+        self._request('bulk', None)
+        return [self._command(p) for p in payload]
+
+    async def bulk_upsert_guild_commands(self, application_id: int, guild_id: int, payload: List[Any]) -> List[Any]:
+        self._request('bulk', guild_id, guild_id=guild_id)
+        return [self._command(p, guild_id) for p in payload]
+
+    async def upsert_global_command(self, application_id: int, payload: Any) -> Any:
+        self._request('create', None, payload['name'])
+        return self._command(payload)
+
+    async def edit_global_command(self, application_id: int, command_id: Any, payload: Any) -> Any:
+        self._request('edit', None, payload['name'])
+        return self._command(payload, command_id=command_id)
+
+    async def delete_global_command(self, application_id: int, command_id: Any) -> None:
+        self._request('delete', None, command_id)
+
+
+def make_command(name: str, description: str = '…', **kwargs: Any) -> Any:
+    async def callback(self: Any) -> None:
+        pass
+
+    return type(SlashCommand)(name.capitalize(), (SlashCommand,), {'__doc__': description, 'callback': callback}, **kwargs)
+
+
+class CommandSyncerTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.client = discord.Client(intents=discord.Intents.none(), application_id=1)
+        self.tree = app_commands.CommandTree(self.client)
+        self.http = StubHTTP()
+        self.tree._http = self.http  # type: ignore
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'commands.json')
+
+    async def test_skip_unchanged(self) -> None:
+        self.tree.add_command(make_command('ping'))
+        syncer = CommandSyncer(self.tree, self.path)
+        self.assertEqual([c.name for c in await syncer.sync()], ['ping'])  # type: ignore
+        self.assertIsNone(await syncer.sync())
+
+        # The fingerprints survive a restart
+        syncer = CommandSyncer(self.tree, self.path)
+        self.assertFalse(await syncer.changed())
+        self.assertIsNone(await syncer.sync())
+        self.assertEqual(self.http.requests, [('bulk', None)])
+
+        self.tree.add_command(make_command('pong'))
+        self.assertTrue(await syncer.changed())
+        await syncer.sync()
+        self.assertEqual(self.http.requests, [('bulk', None), ('bulk', None)])
+
+    async def test_incremental(self) -> None:
+        self.tree.add_command(make_command('ping'))
+        self.tree.add_command(make_command('echo'))
+        syncer = CommandSyncer(self.tree, self.path, incremental=True)
+        await syncer.sync()
+        ids = {key: command_id for key, (command_id, _) in syncer._application()['global']['commands'].items()}
+
+        self.tree.remove_command('echo')
+        self.tree.add_command(make_command('ping', 'Changed.'), override=True)
+        self.tree.add_command(make_command('pong'))
+        commands = await syncer.sync()
+
+        self.assertEqual(
+            self.http.requests[1:],
+            [('delete', None, ids['1:echo']), ('edit', None, 'ping'), ('create', None, 'pong')],
+        )
+        self.assertEqual(sorted(c.name for c in commands), ['ping', 'pong'])  # type: ignore
+        self.assertIsNone(await syncer.sync())
+
+        # Too many changes fall back to overwriting the scope
+        syncer.max_requests = 1
+        self.tree.add_command(make_command('a'))
+        self.tree.add_command(make_command('b'))
+        await syncer.sync()
+        self.assertEqual(self.http.requests[-1], ('bulk', None))
+
+    async def test_sync_all_failures(self) -> None:
+        self.tree.add_command(make_command('ping'))
+        for guild_id in (1, 2, 3):
+            self.tree.add_command(make_command('local'), guild=discord.Object(guild_id))
+
+        self.http.failing.add(2)
+        progress: List[Tuple[Optional[int], bool, int, int]] = []
+        syncer = CommandSyncer(self.tree, self.path)
+        with self.assertRaises(SyncFailure) as context:
+            await syncer.sync_all(progress=lambda g, e, done, total: progress.append((g, e is not None, done, total)))
+
+        failure = context.exception
+        self.assertEqual(set(failure.results), {None, 1, 3})
+        self.assertEqual(set(failure.failures), {2})
+        self.assertEqual(sorted(progress, key=lambda p: p[2])[-1][2:], (4, 4))
+        self.assertEqual({g for g, failed, _, _ in progress if failed}, {2})
+
+        # Only the failed scope is synced again
+        self.http.failing.clear()
+        self.http.requests.clear()
+        results = await syncer.sync_all()
+        self.assertEqual(self.http.requests, [('bulk', 2)])
+        self.assertEqual([g for g, result in results.items() if result is not None], [2])
+
+
+if __name__ == '__main__':
+    unittest.main()